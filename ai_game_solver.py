@@ -6,6 +6,7 @@ import search_algorithm
 from benchmark_utils import plot_metrics, run_algorithm
 from level import Level
 from level_manager import LevelManager
+from portfolio_solver import PortfolioSolver
 
 
 class AIGameSolver:
@@ -19,33 +20,61 @@ class AIGameSolver:
         self.algorithms = {
             1: ("BFS", lambda state: search_algorithm.BFS(deepcopy(state))),
             2: ("IDS", lambda state, optimal_moves: search_algorithm.IDS(deepcopy(state), optimal_moves)),
+            3: ("BidirectionalBFS", lambda state: search_algorithm.BidirectionalBFS(deepcopy(state))),
 
-            3: ("Greedy-SumTeleport", lambda state: search_algorithm.GreedySearch(
+            4: ("Greedy-SumTeleport", lambda state: search_algorithm.GreedySearch(
                 deepcopy(state), heuristic.SumMinMovesTeleport())),
-            4: ("Greedy-MaxTeleport", lambda state: search_algorithm.GreedySearch(
+            5: ("Greedy-MaxTeleport", lambda state: search_algorithm.GreedySearch(
                 deepcopy(state), heuristic.MaxMinMovesTeleport())),
-            5: ("Greedy-SumBlockers", lambda state: search_algorithm.GreedySearch(
+            6: ("Greedy-SumBlockers", lambda state: search_algorithm.GreedySearch(
                 deepcopy(state), heuristic.SumMinMovesBlockers())),
-            6: ("Greedy-MaxBlockers", lambda state: search_algorithm.GreedySearch(
+            7: ("Greedy-MaxBlockers", lambda state: search_algorithm.GreedySearch(
                 deepcopy(state), heuristic.MaxMinMovesBlockers())),
-            7: ("Greedy-SumConflicts", lambda state: search_algorithm.GreedySearch(
+            8: ("Greedy-SumConflicts", lambda state: search_algorithm.GreedySearch(
                 deepcopy(state), heuristic.SumMinMovesConflicts())),
-            8: ("Greedy-MaxConflicts", lambda state: search_algorithm.GreedySearch(
+            9: ("Greedy-MaxConflicts", lambda state: search_algorithm.GreedySearch(
                 deepcopy(state), heuristic.MaxMinMovesConflicts())),
 
-            9: ("Astar-SumTeleport", lambda state: search_algorithm.Astar(
+            10: ("Astar-SumTeleport", lambda state: search_algorithm.Astar(
                 deepcopy(state), heuristic.SumMinMovesTeleport())),
-            10: ("Astar-MaxTeleport", lambda state: search_algorithm.Astar(
+            11: ("Astar-MaxTeleport", lambda state: search_algorithm.Astar(
                 deepcopy(state), heuristic.MaxMinMovesTeleport())),
-            11: ("Astar-SumBlockers", lambda state: search_algorithm.Astar(
+            12: ("Astar-SumBlockers", lambda state: search_algorithm.Astar(
                 deepcopy(state), heuristic.SumMinMovesBlockers())),
-            12: ("Astar-MaxBlockers", lambda state: search_algorithm.Astar(
+            13: ("Astar-MaxBlockers", lambda state: search_algorithm.Astar(
                 deepcopy(state), heuristic.MaxMinMovesBlockers())),
-            13: ("Astar-SumConflicts", lambda state: search_algorithm.Astar(
+            14: ("Astar-SumConflicts", lambda state: search_algorithm.Astar(
                 deepcopy(state), heuristic.SumMinMovesConflicts())),
-            14: ("Astar-MaxConflicts", lambda state: search_algorithm.Astar(
-                deepcopy(state), heuristic.MaxMinMovesConflicts()))
+            15: ("Astar-MaxConflicts", lambda state: search_algorithm.Astar(
+                deepcopy(state), heuristic.MaxMinMovesConflicts())),
+
+            16: ("IDAstar-MaxTeleport", lambda state: search_algorithm.IDAstar(
+                deepcopy(state), heuristic.MaxMinMovesTeleport())),
+            17: ("IDAstar-MaxBlockers", lambda state: search_algorithm.IDAstar(
+                deepcopy(state), heuristic.MaxMinMovesBlockers())),
+            18: ("IDAstar-MaxConflicts", lambda state: search_algorithm.IDAstar(
+                deepcopy(state), heuristic.MaxMinMovesConflicts())),
+
+            19: ("ARAstar-MaxBlockers", lambda state: search_algorithm.ARAstar(
+                deepcopy(state), heuristic.MaxMinMovesBlockers())),
+            20: ("Beam-SumBlockers", lambda state: search_algorithm.BeamSearch(
+                deepcopy(state), heuristic.SumMinMovesBlockers(), restarts=2)),
+            21: ("HDAstar-MaxBlockers", lambda state: search_algorithm.HashDistributedSearch(
+                deepcopy(state), heuristic.MaxMinMovesBlockers())),
+
+            22: ("Astar-MaxPatterns", lambda state: search_algorithm.Astar(
+                deepcopy(state), heuristic.MaxPatternDatabases())),
+            23: ("IDAstar-MaxPatterns", lambda state: search_algorithm.IDAstar(
+                deepcopy(state), heuristic.MaxPatternDatabases())),
+            24: ("Astar-MaxSlides", lambda state: search_algorithm.Astar(
+                deepcopy(state), heuristic.MaxMinMovesSlides())),
+            25: ("IDAstar-MaxSlides", lambda state: search_algorithm.IDAstar(
+                deepcopy(state), heuristic.MaxMinMovesSlides())),
+
+            26: ("BFS-Vectorized", lambda state: search_algorithm.BFS(deepcopy(state), vectorized=True))
         }
+        self.run_all_choice = len(self.algorithms) + 1
+        self.portfolio_choice = len(self.algorithms) + 2
     
     def _choose_algorithm(self) -> int:
         """Displays available algorithms and prompt the user to choose one.
@@ -56,9 +85,50 @@ class AIGameSolver:
         print("\nAvailable algorithms:")
         for i, (name, _) in self.algorithms.items():
             print(f"{i}. {name}")
-        print("15. Run all algorithms and generate comparison plots")
+        print(f"{self.run_all_choice}. Run all algorithms and generate comparison plots")
+        print(f"{self.portfolio_choice}. Race selected algorithms in parallel and keep the first solution")
+
+        return int(input(f"\nEnter your choice (1-{self.portfolio_choice}): "))
 
-        return int(input("\nEnter your choice (1-15): "))
+    def _create_algorithm(self, algorithm_choice: int, initial_state, optimal_moves: int):
+        """Creates the algorithm of a menu entry.
+
+        Args:
+            algorithm_choice (int): The index of the algorithm in the menu.
+            initial_state (GameState): The initial state of the level.
+            optimal_moves (int): The optimal number of moves for the level.
+
+        Returns:
+            Tuple[str, SearchAlgorithm]: The name of the entry and the algorithm.
+        """
+        name, alg_factory = self.algorithms[algorithm_choice]
+        algorithm = (alg_factory(initial_state, optimal_moves)
+                     if name == "IDS" else alg_factory(initial_state))
+        return name, algorithm
+
+    def race_portfolio(self, initial_state, optimal_moves: int):
+        """Prompts for a subset of algorithms and races them in parallel processes.
+
+        Args:
+            initial_state (GameState): The initial state of the level.
+            optimal_moves (int): The optimal number of moves for the level.
+        """
+        choices = input("Enter the algorithms to race (comma-separated numbers): ")
+        configurations = [self._create_algorithm(int(choice), initial_state, optimal_moves)
+                          for choice in choices.split(',') if int(choice) in self.algorithms]
+        require_optimal = input("Require a proven optimal solution? (y/n): ").strip().lower() == 'y'
+
+        portfolio = PortfolioSolver(configurations)
+        result = portfolio.race(require_optimal)
+        for name, error in portfolio.errors:
+            print(f"Error! {name} failed: {error}")
+        if result is None:
+            print("\nNo solution found.")
+            return
+        print(f"\nWinner: {result['winner']} after {result['time']:.2f} seconds")
+        print(f"Solution Path: {result['solution']}")
+        print(f"Solution Moves: {result['solution_moves']}")
+        print(f"Proven optimal: {'yes' if result['optimal'] else 'no'}")
     
     def solve_level(self, level_index: int, level: Level) -> list:
         """Solves a level using selected algorithm(s).
@@ -78,23 +148,27 @@ class AIGameSolver:
         metrics_list = []
         
         if algorithm_choice in self.algorithms:
-            name, alg_factory = self.algorithms[algorithm_choice]
-            algorithm = (alg_factory(initial_state, optimal_moves) 
-                        if name == "IDS" else alg_factory(initial_state))
+            name, algorithm = self._create_algorithm(algorithm_choice, initial_state, optimal_moves)
             metrics = run_algorithm(name, algorithm, level_name, optimal_moves)
             metrics_list.append(metrics)
             
-        elif algorithm_choice == 15:
-            for name, alg_factory in self.algorithms.values():
-                algorithm = (alg_factory(initial_state, optimal_moves) 
-                            if name == "IDS" else alg_factory(initial_state))
-                metrics = run_algorithm(name, algorithm, level_name, optimal_moves)
-                metrics_list.append(metrics)
+        elif algorithm_choice == self.run_all_choice:
+            for choice in self.algorithms:
+                # A failing algorithm is reported without losing the results of the others
+                try:
+                    name, algorithm = self._create_algorithm(choice, initial_state, optimal_moves)
+                    metrics = run_algorithm(name, algorithm, level_name, optimal_moves)
+                    metrics_list.append(metrics)
+                except Exception as e:
+                    print(f"Error running {self.algorithms[choice][0]} on {level_name}: {e}")
+
+        elif algorithm_choice == self.portfolio_choice:
+            self.race_portfolio(initial_state, optimal_moves)
         else:
             print("\nInvalid choice, please try again")
             return []
         
-        if algorithm_choice == 15 or len(metrics_list) > 1:
+        if algorithm_choice == self.run_all_choice or len(metrics_list) > 1:
             plot_metrics(metrics_list)
             
         return metrics_list
\ No newline at end of file
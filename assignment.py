@@ -0,0 +1,116 @@
+import numpy as np
+
+
+def min_sum_assignment(costs: np.ndarray) -> int:
+    """Finds the smallest total cost of assigning every row to a distinct column.
+
+    Runs the Hungarian algorithm with row and column potentials. Rows are
+    added one at a time, each by a shortest augmenting path over reduced
+    costs, and every step of the path search updates all columns at once,
+    which takes O(n^3) time for an n x n matrix.
+
+    Args:
+        costs (np.ndarray): A square matrix of non-negative costs.
+
+    Returns:
+        int: The total cost of an optimal assignment.
+    """
+    n = len(costs)
+    if n == 0:
+        return 0
+    if n == 1:
+        return int(costs[0, 0])
+    if n == 2:
+        return int(min(costs[0, 0] + costs[1, 1], costs[0, 1] + costs[1, 0]))
+    costs = costs.astype(np.float64)
+    # Index 0 stands for a virtual column holding the row being added
+    row_potentials = np.zeros(n + 1)
+    column_potentials = np.zeros(n + 1)
+    column_rows = np.zeros(n + 1, dtype=np.int64) # 1-based row assigned to each column, 0 if none
+    previous_columns = np.zeros(n + 1, dtype=np.int64)
+    for row in range(1, n + 1):
+        column_rows[0] = row
+        column = 0
+        slack = np.full(n + 1, np.inf)
+        used = np.zeros(n + 1, dtype=bool)
+        while True:
+            used[column] = True
+            current_row = column_rows[column]
+            free = ~used
+            free[0] = False
+            reduced = costs[current_row - 1] - row_potentials[current_row] - column_potentials[1:]
+            improved = free[1:] & (reduced < slack[1:])
+            slack[1:][improved] = reduced[improved]
+            previous_columns[1:][improved] = column
+            candidates = np.where(free, slack, np.inf)
+            next_column = int(np.argmin(candidates))
+            delta = candidates[next_column]
+            row_potentials[column_rows[used]] += delta
+            column_potentials[used] -= delta
+            slack[free] -= delta
+            column = next_column
+            if column_rows[column] == 0:
+                break
+        # Flip the assignments along the augmenting path
+        while column:
+            previous = previous_columns[column]
+            column_rows[column] = column_rows[previous]
+            column = previous
+    return int(costs[column_rows[1:] - 1, np.arange(n)].sum())
+
+
+def min_max_assignment(costs: np.ndarray) -> int:
+    """Finds the smallest possible largest cost of assigning every row to a distinct column.
+
+    Solves the bottleneck assignment problem by a binary search over the
+    distinct costs, checking for each threshold whether the rows can be
+    matched using only cells within it.
+
+    Args:
+        costs (np.ndarray): A square matrix of non-negative costs.
+
+    Returns:
+        int: The largest cost of an optimal assignment.
+    """
+    n = len(costs)
+    if n == 0:
+        return 0
+    if n == 1:
+        return int(costs[0, 0])
+    if n == 2:
+        return int(min(max(costs[0, 0], costs[1, 1]), max(costs[0, 1], costs[1, 0])))
+    # Every row and every column has to use one of its cells, which bounds the answer from below
+    lower_bound = max(costs.min(axis=1).max(), costs.min(axis=0).max())
+    thresholds = np.unique(costs[costs >= lower_bound])
+    low, high = 0, len(thresholds) - 1
+    while low < high:
+        middle = (low + high) // 2
+        if _has_perfect_matching(costs <= thresholds[middle]):
+            high = middle
+        else:
+            low = middle + 1
+    return int(thresholds[low])
+
+
+def _has_perfect_matching(allowed: np.ndarray) -> bool:
+    """Tells whether every row can be matched to a distinct allowed column.
+
+    Args:
+        allowed (np.ndarray): A square boolean matrix of the allowed cells.
+
+    Returns:
+        bool: True if a perfect matching exists, False otherwise.
+    """
+    neighbours = [np.flatnonzero(row).tolist() for row in allowed]
+    column_rows = [-1] * len(allowed)
+
+    def augment(row: int, visited: list) -> bool:
+        for column in neighbours[row]:
+            if not visited[column]:
+                visited[column] = True
+                if column_rows[column] == -1 or augment(column_rows[column], visited):
+                    column_rows[column] = row
+                    return True
+        return False
+
+    return all(augment(row, [False] * len(allowed)) for row in range(len(allowed)))
@@ -9,6 +9,7 @@ import seaborn as sns
 
 import heuristic
 import search_algorithm
+from bitboard import BitboardState
 from level_manager import LevelManager
 from benchmark_utils import run_algorithm
 
@@ -24,6 +25,14 @@ def parse_args():
                        help='Generate plots from benchmark results')
     parser.add_argument('--levels-list', type=str, 
                        help='Comma-separated list of levels to benchmark')
+    parser.add_argument('--bitboard', action='store_true',
+                       help='Run the searches on the bitboard state engine')
+    parser.add_argument('--time-limit', type=float,
+                       help='Stop each search after this many seconds')
+    parser.add_argument('--node-limit', type=int,
+                       help='Stop each search after expanding this many states')
+    parser.add_argument('--memory-limit', type=int,
+                       help='Stop each search once it allocates this many megabytes')
     return parser.parse_args()
 
 def run_benchmark(args=None):
@@ -38,6 +47,7 @@ def run_benchmark(args=None):
     algorithms = [
         ("BFS", lambda state: search_algorithm.BFS(deepcopy(state))),
         ("IDS", lambda state, optimal_moves: search_algorithm.IDS(deepcopy(state), optimal_moves)),
+        ("BidirectionalBFS", lambda state: search_algorithm.BidirectionalBFS(deepcopy(state))),
         ("Greedy-SumTeleport", lambda state: search_algorithm.GreedySearch(
             deepcopy(state), heuristic.SumMinMovesTeleport())),
         ("Greedy-MaxTeleport", lambda state: search_algorithm.GreedySearch(
@@ -61,7 +71,28 @@ def run_benchmark(args=None):
         ("Astar-SumConflicts", lambda state: search_algorithm.Astar(
             deepcopy(state), heuristic.SumMinMovesConflicts())),
         ("Astar-MaxConflicts", lambda state: search_algorithm.Astar(
-            deepcopy(state), heuristic.MaxMinMovesConflicts()))
+            deepcopy(state), heuristic.MaxMinMovesConflicts())),
+        ("IDAstar-MaxTeleport", lambda state: search_algorithm.IDAstar(
+            deepcopy(state), heuristic.MaxMinMovesTeleport())),
+        ("IDAstar-MaxBlockers", lambda state: search_algorithm.IDAstar(
+            deepcopy(state), heuristic.MaxMinMovesBlockers())),
+        ("IDAstar-MaxConflicts", lambda state: search_algorithm.IDAstar(
+            deepcopy(state), heuristic.MaxMinMovesConflicts())),
+        ("ARAstar-MaxBlockers", lambda state: search_algorithm.ARAstar(
+            deepcopy(state), heuristic.MaxMinMovesBlockers())),
+        ("Beam-SumBlockers", lambda state: search_algorithm.BeamSearch(
+            deepcopy(state), heuristic.SumMinMovesBlockers(), restarts=2)),
+        ("HDAstar-MaxBlockers", lambda state: search_algorithm.HashDistributedSearch(
+            deepcopy(state), heuristic.MaxMinMovesBlockers())),
+        ("Astar-MaxPatterns", lambda state: search_algorithm.Astar(
+            deepcopy(state), heuristic.MaxPatternDatabases())),
+        ("IDAstar-MaxPatterns", lambda state: search_algorithm.IDAstar(
+            deepcopy(state), heuristic.MaxPatternDatabases())),
+        ("Astar-MaxSlides", lambda state: search_algorithm.Astar(
+            deepcopy(state), heuristic.MaxMinMovesSlides())),
+        ("IDAstar-MaxSlides", lambda state: search_algorithm.IDAstar(
+            deepcopy(state), heuristic.MaxMinMovesSlides())),
+        ("BFS-Vectorized", lambda state: search_algorithm.BFS(deepcopy(state), vectorized=True))
     ]
     
     # Parse levels list from arguments
@@ -80,12 +111,16 @@ def run_benchmark(args=None):
             continue
         level = level_list[0]
         level_name = f"Level {level_idx}"
+        initial_state = BitboardState.from_game_state(level.initial_state) if args.bitboard else level.initial_state
         print(f"\n===== Running benchmark for {level_name} =====")
         
         for alg_name, alg_factory in algorithms:
             print(f"\nRunning {alg_name} on {level_name}...")
             try:
-                algorithm_instance = alg_factory(level.initial_state) if alg_name != "IDS" else alg_factory(level.initial_state, level.optimal_moves)
+                algorithm_instance = alg_factory(initial_state) if alg_name != "IDS" else alg_factory(initial_state, level.optimal_moves)
+                algorithm_instance.set_budget(
+                    node_limit=args.node_limit, time_limit=args.time_limit,
+                    memory_limit=args.memory_limit * 1024 * 1024 if args.memory_limit else None)
                 metrics = run_algorithm(alg_name, algorithm_instance, level_name, level.optimal_moves)
                 all_metrics.append(metrics)
             except Exception as e:
@@ -126,6 +161,7 @@ def generate_plots(df):
         color_map = {
             "BFS": "orange",
             "IDS": "yellow",
+            "BidirectionalBFS": "#C62828",
             "Greedy-SumTeleport": "#163EF5",
             "Greedy-MaxTeleport": "#738BF9",
             "Greedy-SumBlockers": "#A2B2FB",
@@ -138,14 +174,21 @@ def generate_plots(df):
             "Astar-MaxBlockers": "#00796B",
             "Astar-SumConflicts": "#D0FDEA",
             "Astar-MaxConflicts": "#009E8B",
+            "IDAstar-MaxTeleport": "#F57F17",
+            "IDAstar-MaxBlockers": "#8D4004",
+            "IDAstar-MaxConflicts": "#FFB74D",
+            "ARAstar-MaxBlockers": "#6A1B9A",
+            "Beam-SumBlockers": "#AD1457",
+            "HDAstar-MaxBlockers": "#4E342E",
+            "Astar-MaxPatterns": "#1B5E20",
+            "IDAstar-MaxPatterns": "#E65100",
+            "Astar-MaxSlides": "#26A69A",
+            "IDAstar-MaxSlides": "#BF360C",
+            "BFS-Vectorized": "#FF8F00",
         }
 
-        # Generate colors based on the category
-        labels = list(color_map.keys())
-        colors = [color_map[label] for label in labels]
-
-        # Create a palette for seaborn
-        palette = sns.color_palette(colors)
+        # Seaborn maps every algorithm of the data to its color by name
+        palette = {alg: color_map[alg] for alg in subset_df["algorithm"].unique()}
         # Time comparison
         plt.figure(figsize=(14, 10))
         sns.barplot(x="level", y="time", hue="algorithm", data=subset_df, palette=palette)
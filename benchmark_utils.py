@@ -4,6 +4,8 @@ import matplotlib.patheffects as path_effects
 import matplotlib.pyplot as plt
 import numpy as np
 
+PROGRESS_INTERVAL = 100000 # Number of expanded states between progress lines
+
 
 def run_algorithm(algorithm_name, algorithm_instance, level_name, optimal_moves):
     """Runs the specified algorithm and collects metrics.
@@ -18,19 +20,26 @@ def run_algorithm(algorithm_name, algorithm_instance, level_name, optimal_moves)
         dict: A dictionary containing the metrics collected during the run.
     """
     print(f"\n{algorithm_name}:")
-    solution_path, solution_moves = algorithm_instance.solve()
+    for progress in algorithm_instance.solve_iter(PROGRESS_INTERVAL):
+        bound = "-" if progress.bound is None else progress.bound
+        frontier = "-" if progress.frontier_size is None else progress.frontier_size
+        closed = "-" if progress.closed_size is None else progress.closed_size
+        print(f"  {progress.states_expanded} states, bound {bound}, frontier {frontier}, "
+              f"closed {closed}, {progress.states_per_second:.0f} states/s")
+    status, solution_path, solution_moves, _ = algorithm_instance.result
     
     if solution_path:
         print(f"Solution Path: {solution_path}")
         print(f"Solution Moves: {solution_moves}")
     else:
-        print("No solution found.")
+        print(f"No solution found ({status.value}).")
     
     algorithm_instance.metrics_collector.print_metrics(solution_moves, optimal_moves)
     
     metrics = {
         "level": level_name,
-        "algorithm": algorithm_name
+        "algorithm": algorithm_name,
+        "status": status.value
     }
     metrics.update(algorithm_instance.metrics_collector.get_metrics(solution_moves, optimal_moves))
     metrics.update({
@@ -61,38 +70,40 @@ def plot_metrics(metrics_list):
 
     # Define colors for each algorithm
     color_map = {
+        "ARAstar-MaxBlockers": "#6A1B9A",
         "Astar-MaxBlockers": "#00796B",
         "Astar-MaxConflicts": "#009E8B",
+        "Astar-MaxPatterns": "#1B5E20",
+        "Astar-MaxSlides": "#26A69A",
         "Astar-MaxTeleport": "#00EACE",
         "Astar-SumBlockers": "#A1FBD5",
         "Astar-SumConflicts": "#D0FDEA",
         "Astar-SumTeleport": "#057F4C",
         "BFS": "orange",
+        "BFS-Vectorized": "#FF8F00",
+        "Beam-SumBlockers": "#AD1457",
+        "BidirectionalBFS": "#C62828",
         "Greedy-MaxBlockers": "#061B80",
         "Greedy-MaxConflicts": "#0829C0",
         "Greedy-MaxTeleport": "#738BF9",
         "Greedy-SumBlockers": "#A2B2FB",
         "Greedy-SumConflicts": "#D0D8FD",
         "Greedy-SumTeleport": "#163EF5",
+        "HDAstar-MaxBlockers": "#4E342E",
+        "IDAstar-MaxBlockers": "#8D4004",
+        "IDAstar-MaxConflicts": "#FFB74D",
+        "IDAstar-MaxPatterns": "#E65100",
+        "IDAstar-MaxSlides": "#BF360C",
+        "IDAstar-MaxTeleport": "#F57F17",
         "IDS": "yellow"
     }
 
-    # Generate colors based on the category
-    labels = [
-        "Astar-MaxBlockers", "Astar-MaxConflicts", "Astar-MaxTeleport", "Astar-SumBlockers", "Astar-SumConflicts",
-        "Astar-SumTeleport",
-        "BFS",
-        "Greedy-MaxBlockers", "Greedy-MaxConflicts", "Greedy-MaxTeleport", "Greedy-SumBlockers", "Greedy-SumConflicts",
-        "Greedy-SumTeleport",
-        "IDS"
-    ]
-    colors = [color_map[label] for label in labels]
 
 
     for i, alg in enumerate(algorithms):
         times = [next((m["time"] for m in metrics_list if m["algorithm"] == alg and m["level"] == level), 0) 
                 for level in levels]
-        plt.bar(index + i*bar_width, times, bar_width, label=alg, color=colors[i])
+        plt.bar(index + i*bar_width, times, bar_width, label=alg, color=color_map[alg])
     
     plt.xlabel('Level')
     plt.ylabel('Time (seconds)')
@@ -109,7 +120,7 @@ def plot_metrics(metrics_list):
     for i, alg in enumerate(algorithms):
         memory = [next((m["memory"]/1024/1024 for m in metrics_list if m["algorithm"] == alg and m["level"] == level), 0) 
                  for level in levels]
-        plt.bar(index + i*bar_width, memory, bar_width, label=alg, color=colors[i])
+        plt.bar(index + i*bar_width, memory, bar_width, label=alg, color=color_map[alg])
     
     plt.xlabel('Level')
     plt.ylabel('Memory (MB)')
@@ -124,7 +135,7 @@ def plot_metrics(metrics_list):
     for i, alg in enumerate(algorithms):
         states = [next((m["states_generated"] for m in metrics_list if m["algorithm"] == alg and m["level"] == level), 0) 
                  for level in levels]
-        plt.bar(index + i*bar_width, states, bar_width, label=alg, color=colors[i])
+        plt.bar(index + i*bar_width, states, bar_width, label=alg, color=color_map[alg])
     
     plt.xlabel('Level')
     plt.ylabel('States Generated')
@@ -144,7 +155,7 @@ def plot_metrics(metrics_list):
         optimal_moves = [next((m["optimal_moves"] for m in metrics_list if m["algorithm"] == alg and m["level"] == level), 0)
                         for level in levels]
         # Plot bars with normal alpha unless they represent the optimal solution
-        bars = plt.bar(index + i * bar_width, moves, bar_width, label=alg, color=colors[i])
+        bars = plt.bar(index + i * bar_width, moves, bar_width, label=alg, color=color_map[alg])
 
         # Plot optimal bars with alpha=0.3
         for j, (bar, opt) in enumerate(zip(bars, optimal_moves)):
@@ -0,0 +1,205 @@
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from board import Board
+from game_state import GameState
+
+
+class BitboardState:
+    """Game state keeping one integer bitmask of tile positions per color.
+
+    It exposes the same interface as GameState, so it can be passed to any
+    SearchAlgorithm, move or heuristic in place of a GameState. Cell (x, y)
+    is stored in bit y * size + x. Its keys are the concatenated color masks
+    rather than the packed keys of GameState, so the searches that decode
+    keys or exchange states with other processes, ExternalBFS and HDA*,
+    convert the initial state to a GameState and run on the dictionary
+    representation.
+    """
+    __slots__ = ("board", "masks", "occupied", "_tiles", "_key", "_zobrist")
+
+    def __init__(self, board: Board, masks: Tuple[int, ...]):
+        """Initializes the BitboardState.
+
+        Args:
+            board (Board): The shared layout of the level.
+            masks (Tuple[int, ...]): The tile positions, one mask per color of the board.
+        """
+        self.board = board
+        self.masks = masks
+        occupied = 0
+        for mask in masks:
+            occupied |= mask
+        self.occupied = occupied # Mask of the cells holding a tile of any color
+        self._tiles = None
+        self._key = None
+        self._zobrist = None
+
+    @classmethod
+    def from_game_state(cls, state: GameState) -> 'BitboardState':
+        """Creates a BitboardState equivalent to a GameState.
+
+        Args:
+            state (GameState): The state to convert.
+
+        Returns:
+            BitboardState: The converted state.
+        """
+        board = state.board
+        masks = [0] * len(board.colors)
+        for pos, color in state.tiles.items():
+            masks[board.color_index[color]] |= board.bit(pos)
+        return cls(board, tuple(masks))
+
+    def to_game_state(self) -> GameState:
+        """Converts the state back to a GameState.
+
+        Returns:
+            GameState: The equivalent GameState.
+        """
+        return GameState(self.tiles, board=self.board)
+
+    def slide(self, direction: int) -> Optional['BitboardState']:
+        """Slides all tiles in the given direction.
+
+        The slide of the occupancy of all colors is looked up on the board,
+        and every color mask is then moved with one shift per group of tiles
+        sliding the same distance.
+
+        Args:
+            direction (int): One of LEFT, RIGHT, UP or DOWN.
+
+        Returns:
+            Optional[BitboardState]: The new state, or None if no tile moved.
+        """
+        board = self.board
+        occupied = self.occupied
+        slide = board.slide_tables[direction].get(occupied, False)
+        if slide is False:
+            slide = board.slide_groups(direction, occupied)
+        if slide is None:
+            return None
+        moving, after, groups = slide
+        towards_low = board.slides[direction][1]
+        masks = []
+        for mask in self.masks:
+            moved = mask & moving
+            if moved:
+                mask ^= moved
+                for shift, group in groups:
+                    part = moved & group
+                    if part:
+                        mask |= (part >> shift) if towards_low else (part << shift)
+            masks.append(mask)
+        state = BitboardState.__new__(BitboardState)
+        state.board = board
+        state.masks = tuple(masks)
+        state.occupied = after
+        state._tiles = None
+        state._key = None
+        state._zobrist = None
+        return state
+
+    def apply_moves(self, moves: List[Tuple[Tuple[int, int], Tuple[int, int]]]) -> 'BitboardState':
+        """Creates the state reached by moving tiles of this state.
+
+        Args:
+            moves (List[Tuple[Tuple[int, int], Tuple[int, int]]]): The (from, to) positions of the
+                moving tiles, in an order where no tile moves onto a cell not yet left.
+
+        Returns:
+            BitboardState: The new state.
+        """
+        board = self.board
+        masks = list(self.masks)
+        for source, destination in moves:
+            source_bit = board.bit(source)
+            for i, mask in enumerate(masks):
+                if mask & source_bit:
+                    masks[i] = mask ^ source_bit ^ board.bit(destination)
+                    break
+        return BitboardState(board, tuple(masks))
+
+    def is_solved(self) -> bool:
+        """Checks if all the tiles are placed in targets of corresponding color.
+
+        Returns:
+            bool: True if the game is solved, False otherwise.
+        """
+        for mask, target_mask in zip(self.masks, self.board.target_masks):
+            if mask & ~target_mask:
+                return False
+        return True
+
+    @property
+    def tiles(self) -> Dict[Tuple[int, int], str]:
+        # Decoded once, heuristics read the tiles several times per state
+        if self._tiles is None:
+            tiles = {}
+            for color, mask in zip(self.board.colors, self.masks):
+                for pos in self.board.positions(mask):
+                    tiles[pos] = color
+            self._tiles = tiles
+        return self._tiles
+
+    @property
+    def targets(self) -> Dict[Tuple[int, int], str]:
+        return self.board.targets
+
+    @property
+    def blockers(self) -> FrozenSet[Tuple[int, int]]:
+        return self.board.blockers
+
+    @property
+    def size(self) -> int:
+        return self.board.size
+
+    @property
+    def blanks(self) -> List[Tuple[int, int]]:
+        covered = 0
+        for mask in self.masks:
+            covered |= mask
+        for mask in self.board.target_masks:
+            covered |= mask
+        return self.board.positions(self.board.open_mask & ~covered)
+
+    def key(self) -> int:
+        """Returns a canonical key of the tile occupancy.
+
+        Returns:
+            int: The color masks concatenated into a single integer, cached on the state.
+        """
+        if self._key is None:
+            cells = self.board.size * self.board.size
+            key = 0
+            for i, mask in enumerate(self.masks):
+                key |= mask << (i * cells)
+            self._key = key
+        return self._key
+
+    def zobrist_hash(self) -> int:
+        """Returns the Zobrist hash of the tile occupancy.
+
+        It is equal to the hash of the equivalent GameState, and cached on the state.
+
+        Returns:
+            int: The 64-bit hash.
+        """
+        if self._zobrist is None:
+            zobrist_keys = self.board.zobrist_keys
+            zobrist = 0
+            for color, mask in zip(self.board.colors, self.masks):
+                for pos in self.board.positions(mask):
+                    zobrist ^= zobrist_keys[pos, color]
+            self._zobrist = zobrist
+        return self._zobrist
+
+    def __eq__(self, other):
+        if isinstance(other, BitboardState):
+            return self.masks == other.masks and self.board == other.board
+        return False
+
+    def __hash__(self):
+        return hash(self.masks)
+
+    def __str__(self):
+        return str(self.to_game_state())
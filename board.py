@@ -0,0 +1,289 @@
+import random
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+LEFT, RIGHT, UP, DOWN = range(4)
+DIRECTION_STEPS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def slide_line(open_flags: Tuple[bool, ...], contents: Tuple[Optional[str], ...]) -> Tuple[Optional[str], ...]:
+    """Slides the tiles of one row or column towards its first cell.
+
+    Args:
+        open_flags (Tuple[bool, ...]): Whether each cell of the line can hold a tile,
+            starting at the cell the tiles slide towards.
+        contents (Tuple[Optional[str], ...]): The tile color in each cell, or None.
+
+    Returns:
+        Tuple[Optional[str], ...]: The contents after the slide.
+    """
+    result = [None] * len(contents)
+    free = 0
+    for i, (is_open, color) in enumerate(zip(open_flags, contents)):
+        if not is_open:
+            free = i + 1
+        elif color is not None:
+            result[free] = color
+            free += 1
+    return tuple(result)
+
+
+class Board:
+    """Immutable layout of a level shared by all states of that level.
+
+    Holds everything that does not change while tiles move: the size, the
+    blockers, the targets, the cells tiles may occupy and tables derived from
+    them. Cell (x, y) is stored in bit y * size + x of the bit masks.
+    """
+    LINE_TABLE_SIZE = 1 << 14 # Maximum number of cached occupancy patterns per line
+    SLIDE_TABLE_SIZE = 1 << 16 # Maximum number of cached bitboard occupancies per direction
+    ZOBRIST_SEED = 2024 # Fixed so that hashes of equal states agree across boards and processes
+
+    def __init__(self, targets: Dict[Tuple[int, int], str], blockers: Iterable[Tuple[int, int]],
+                 open_cells: Iterable[Tuple[int, int]], size: int):
+        """Initializes the Board.
+
+        Args:
+            targets (Dict[Tuple[int, int], str]): The positions and colors of the targets.
+            blockers (Iterable[Tuple[int, int]]): The positions of the blockers.
+            open_cells (Iterable[Tuple[int, int]]): The positions tiles are allowed to occupy.
+            size (int): The size of the game board.
+        """
+        self.targets = dict(targets)
+        self.blockers = frozenset(blockers)
+        self.open_cells = frozenset(open_cells) - self.blockers
+        self.size = size
+        self.colors = tuple(sorted(set(self.targets.values())))
+        self.color_index = {color: i for i, color in enumerate(self.colors)}
+        self.key_bits = len(self.colors).bit_length()
+        # Contribution of a tile of each color on each cell to the packed state key
+        self.cell_codes = {(pos, color): self.cell_code(pos, color)
+                           for pos in self.open_cells for color in self.colors}
+        # Random 64-bit key of a tile of each color on each cell, XOR-ed together by Zobrist hashing
+        zobrist_random = random.Random(self.ZOBRIST_SEED)
+        self.zobrist_keys = {(pos, color): zobrist_random.getrandbits(64)
+                             for pos in sorted(self.open_cells) for color in self.colors}
+
+        # Cells a tile passes when sliding alone from a cell, nearest first
+        self.rays = tuple({pos: self._ray(pos, step) for pos in self.open_cells} for step in DIRECTION_STEPS)
+
+        # Rows or columns per direction, listed from the cell the tiles slide towards, with their open cells
+        self.lines = tuple(tuple(self._line(index, direction) for index in range(size)) for direction in range(4))
+        # Coordinate of a position giving its line number: y for horizontal slides, x for vertical ones
+        self.line_axis = (1, 1, 0, 0)
+        # Slide transitions per direction and line, filled lazily by line_moves
+        self.line_tables = tuple(tuple({} for _ in range(size)) for _ in range(4))
+
+        self.open_mask = 0
+        for pos in self.open_cells:
+            self.open_mask |= self.bit(pos)
+
+        target_masks = [0] * len(self.colors)
+        for pos, color in self.targets.items():
+            target_masks[self.color_index[color]] |= self.bit(pos)
+        self.target_masks = tuple(target_masks)
+
+        first_column = 0
+        last_column = 0
+        for y in range(size):
+            first_column |= 1 << (y * size)
+            last_column |= 1 << (y * size + size - 1)
+        board_mask = (1 << (size * size)) - 1
+
+        # (shift, moves towards lower bit indexes, cells a tile may leave from) per direction
+        self.slides = (
+            (1, True, board_mask & ~first_column),
+            (1, False, board_mask & ~last_column),
+            (size, True, board_mask),
+            (size, False, board_mask),
+        )
+        # Bitboard slides per direction, keyed by the occupancy of all tiles, filled lazily by slide_groups
+        self.slide_tables = tuple({} for _ in range(4))
+
+    def _ray(self, pos: Tuple[int, int], step: Tuple[int, int]) -> Tuple[Tuple[int, int], ...]:
+        """Lists the open cells from a position towards a direction until the first wall or blocker.
+
+        Args:
+            pos (Tuple[int, int]): The starting position.
+            step (Tuple[int, int]): The offset of one step in the direction.
+
+        Returns:
+            Tuple[Tuple[int, int], ...]: The cells passed, nearest first.
+        """
+        cells = []
+        x, y = pos[0] + step[0], pos[1] + step[1]
+        while (x, y) in self.open_cells:
+            cells.append((x, y))
+            x, y = x + step[0], y + step[1]
+        return tuple(cells)
+
+    def _line(self, index: int, direction: int) -> Tuple[Tuple[Tuple[int, int], ...], Tuple[bool, ...]]:
+        """Lists the cells of a row or column in slide order.
+
+        Args:
+            index (int): The row number for horizontal directions, the column number otherwise.
+            direction (int): One of LEFT, RIGHT, UP or DOWN.
+
+        Returns:
+            Tuple[Tuple[Tuple[int, int], ...], Tuple[bool, ...]]: The positions, starting at the cell
+                the tiles slide towards, and whether each of them is open.
+        """
+        if direction in (LEFT, RIGHT):
+            positions = [(i, index) for i in range(self.size)]
+        else:
+            positions = [(index, i) for i in range(self.size)]
+        if direction in (RIGHT, DOWN):
+            positions.reverse()
+        return tuple(positions), tuple(pos in self.open_cells for pos in positions)
+
+    def line_moves(self, direction: int, index: int,
+                   contents: Tuple[Optional[str], ...]) -> Tuple[Tuple[Tuple[int, int], Tuple[int, int]], ...]:
+        """Looks up the tile moves of one line for a slide, computing and caching them on first use.
+
+        Args:
+            direction (int): One of LEFT, RIGHT, UP or DOWN.
+            index (int): The line number, see line_axis.
+            contents (Tuple[Optional[str], ...]): The tile color in each cell of the line in
+                slide order, or None.
+
+        Returns:
+            Tuple[Tuple[Tuple[int, int], Tuple[int, int]], ...]: The (from, to) positions of the tiles
+                that move, leading tile first, empty if nothing moves.
+        """
+        table = self.line_tables[direction][index]
+        moves = table.get(contents)
+        if moves is None:
+            positions, open_flags = self.lines[direction][index]
+            slid = slide_line(open_flags, contents)
+            sources = [pos for pos, color in zip(positions, contents) if color is not None]
+            destinations = [pos for pos, color in zip(positions, slid) if color is not None]
+            moves = tuple((source, destination) for source, destination in zip(sources, destinations)
+                          if source != destination)
+            if len(table) >= self.LINE_TABLE_SIZE:
+                table.clear()
+            table[contents] = moves
+        return moves
+
+    def slide_groups(self, direction: int, occupied: int) -> Optional[Tuple[int, int, Tuple[Tuple[int, int], ...]]]:
+        """Looks up how the tiles of an occupancy mask slide, computing and caching it on first use.
+
+        Slides keep the order of the tiles along every line, so where each
+        tile ends up only depends on the occupancy of all colors together.
+        The tiles are grouped by the number of bits they are shifted by, and
+        a bitboard of any color is slid with one shift per group.
+
+        Args:
+            direction (int): One of LEFT, RIGHT, UP or DOWN.
+            occupied (int): The mask of the cells holding a tile.
+
+        Returns:
+            Optional[Tuple[int, int, Tuple[Tuple[int, int], ...]]]: The mask of the tiles that move,
+                the occupancy after the slide and the (shift, tiles shifted by it) of every group,
+                or None if no tile moves.
+        """
+        table = self.slide_tables[direction]
+        if occupied in table:
+            return table[occupied]
+        shift, towards_low, sources = self.slides[direction]
+        after = occupied
+        free = self.open_mask & ~occupied
+        # Current cells of the tiles by the number of cells they have moved so far
+        groups = [occupied]
+        while True:
+            leaving = after & ((free << shift) if towards_low else (free >> shift)) & sources
+            if not leaving:
+                break
+            arriving = (leaving >> shift) if towards_low else (leaving << shift)
+            after ^= leaving ^ arriving
+            free ^= leaving ^ arriving
+            groups.append(0)
+            for distance in range(len(groups) - 2, -1, -1):
+                stepping = groups[distance] & leaving
+                if stepping:
+                    groups[distance] ^= stepping
+                    groups[distance + 1] |= (stepping >> shift) if towards_low else (stepping << shift)
+
+        slide = None
+        if len(groups) > 1:
+            # Each group is stored by the cells its tiles leave from
+            shifted = []
+            moving = 0
+            for distance, group in enumerate(groups):
+                if distance and group:
+                    bits = distance * shift
+                    group = (group << bits) if towards_low else (group >> bits)
+                    shifted.append((bits, group))
+                    moving |= group
+            slide = (moving, after, tuple(shifted))
+        if len(table) >= self.SLIDE_TABLE_SIZE:
+            table.clear()
+        table[occupied] = slide
+        return slide
+
+    def blanks(self, tiles: Dict[Tuple[int, int], str]) -> List[Tuple[int, int]]:
+        """Lists the empty non-target cells for the given tile positions.
+
+        Args:
+            tiles (Dict[Tuple[int, int], str]): The positions and colors of the tiles.
+
+        Returns:
+            List[Tuple[int, int]]: The positions of the blank spaces.
+        """
+        return [pos for pos in self.open_cells if pos not in self.targets and pos not in tiles]
+
+    def cell_code(self, pos: Tuple[int, int], color: str) -> int:
+        """Returns the contribution of a tile to the packed state key.
+
+        Args:
+            pos (Tuple[int, int]): The position of the tile.
+            color (str): The color of the tile.
+
+        Returns:
+            int: The 1-based color index shifted to the bits of the cell.
+        """
+        return (self.color_index[color] + 1) << (self.key_bits * (pos[1] * self.size + pos[0]))
+
+    def bit(self, pos: Tuple[int, int]) -> int:
+        """Returns the bit of a board position.
+
+        Args:
+            pos (Tuple[int, int]): The position on the board.
+
+        Returns:
+            int: The single-bit mask of the position.
+        """
+        return 1 << (pos[1] * self.size + pos[0])
+
+    def positions(self, mask: int) -> List[Tuple[int, int]]:
+        """Decodes a mask into board positions.
+
+        Args:
+            mask (int): The mask to decode.
+
+        Returns:
+            List[Tuple[int, int]]: The positions of the set bits, in bit order.
+        """
+        positions = []
+        while mask:
+            low = mask & -mask
+            index = low.bit_length() - 1
+            positions.append((index % self.size, index // self.size))
+            mask ^= low
+        return positions
+
+    def _signature(self) -> Tuple[int, FrozenSet, FrozenSet, FrozenSet]:
+        return self.size, self.blockers, self.open_cells, frozenset(self.targets.items())
+
+    def __eq__(self, other):
+        if isinstance(other, Board):
+            return self is other or self._signature() == other._signature()
+        return False
+
+    def __hash__(self):
+        return hash(self._signature())
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # The board never changes, so copies of a state can keep sharing it
+        return self
@@ -0,0 +1,127 @@
+from collections import deque
+from typing import Any, Tuple
+
+
+class BucketQueue:
+    """Priority queue for small non-negative integer priorities.
+
+    Items are kept in one bucket per priority, and a cursor points at the
+    lowest bucket that may hold items. Pushing appends to a bucket and popping
+    takes from the bucket under the cursor, so both are O(1) apart from moving
+    the cursor over empty buckets, which is bounded by the largest priority.
+    Items of equal priority come out in insertion order, or in reverse
+    insertion order for a LIFO queue.
+    """
+
+    def __init__(self, lifo: bool = False):
+        """Initializes the BucketQueue.
+
+        Args:
+            lifo (bool, optional): Pop the most recently pushed item among equal
+                priorities instead of the oldest one. Defaults to False.
+        """
+        self.lifo = lifo
+        self._buckets = []
+        self._cursor = 0
+        self._size = 0
+
+    def push(self, priority: int, item: Any):
+        """Adds an item.
+
+        Args:
+            priority (int): The priority of the item, lower is popped first.
+            item (Any): The item to add.
+        """
+        while priority >= len(self._buckets):
+            self._buckets.append(deque())
+        self._buckets[priority].append(item)
+        if priority < self._cursor:
+            self._cursor = priority
+        self._size += 1
+
+    def pop(self) -> Tuple[int, Any]:
+        """Removes the item with the lowest priority.
+
+        Returns:
+            Tuple[int, Any]: The priority and the item.
+
+        Raises:
+            IndexError: If the queue is empty.
+        """
+        if not self._size:
+            raise IndexError("pop from an empty BucketQueue")
+        while not self._buckets[self._cursor]:
+            self._cursor += 1
+        bucket = self._buckets[self._cursor]
+        self._size -= 1
+        return self._cursor, bucket.pop() if self.lifo else bucket.popleft()
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class TwoLevelBucketQueue:
+    """Bucket queue breaking ties between equal priorities by a second integer key.
+
+    Every priority has its own buckets, one per tie-break key, and the
+    highest tie-break key is popped first within the lowest priority. Each
+    priority keeps a cursor on its highest bucket that may hold items, which
+    only moves down as it is emptied and up when a higher key is pushed.
+    Items of equal priority and tie-break key come out in insertion order.
+    """
+
+    def __init__(self):
+        """Initializes the TwoLevelBucketQueue."""
+        self._buckets = [] # Per priority, the buckets of every tie-break key
+        self._tops = [] # Per priority, the highest tie-break key that may hold items
+        self._counts = [] # Per priority, the number of items
+        self._cursor = 0
+        self._size = 0
+
+    def push(self, priority: int, tie_break: int, item: Any):
+        """Adds an item.
+
+        Args:
+            priority (int): The priority of the item, lower is popped first.
+            tie_break (int): The tie-break key of the item, higher is popped first among equal priorities.
+            item (Any): The item to add.
+        """
+        while priority >= len(self._buckets):
+            self._buckets.append([])
+            self._tops.append(-1)
+            self._counts.append(0)
+        buckets = self._buckets[priority]
+        while tie_break >= len(buckets):
+            buckets.append(deque())
+        buckets[tie_break].append(item)
+        if tie_break > self._tops[priority]:
+            self._tops[priority] = tie_break
+        self._counts[priority] += 1
+        if priority < self._cursor:
+            self._cursor = priority
+        self._size += 1
+
+    def pop(self) -> Tuple[int, Any]:
+        """Removes the item with the highest tie-break key among those with the lowest priority.
+
+        Returns:
+            Tuple[int, Any]: The priority and the item.
+
+        Raises:
+            IndexError: If the queue is empty.
+        """
+        if not self._size:
+            raise IndexError("pop from an empty TwoLevelBucketQueue")
+        while not self._counts[self._cursor]:
+            self._cursor += 1
+        buckets = self._buckets[self._cursor]
+        top = self._tops[self._cursor]
+        while not buckets[top]:
+            top -= 1
+        self._tops[self._cursor] = top
+        self._counts[self._cursor] -= 1
+        self._size -= 1
+        return self._cursor, buckets[top].popleft()
+
+    def __len__(self) -> int:
+        return self._size
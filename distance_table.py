@@ -0,0 +1,203 @@
+import os
+from collections import Counter
+from math import comb, prod
+from typing import Optional
+
+import numpy as np
+
+from board import Board
+from game_state import GameState
+from move import POSSIBLE_MOVES, generate_successors, predecessors
+
+UNSOLVABLE = 255 # Distance stored for states the goal cannot be reached from
+
+
+class DistanceTable:
+    """Exact number of moves to the goal of every state of a level.
+
+    The table is built by a retrograde analysis: a breadth-first search
+    backwards from the goal, through the predecessors of the slide rules,
+    labels every state the goal can be reached from with its distance. This
+    covers every state reachable from the level's start, and any state left
+    unlabelled is a dead end.
+
+    Distances are kept in a uint8 array indexed by a packed state index.
+    Tiles of the same color are interchangeable, so the cells holding the
+    tiles of one color are ranked as a combination of the open cells, and the
+    ranks of all colors are combined in mixed radix. Hints, optimality checks
+    and dead-end checks are then a few lookups.
+    """
+    MAX_ENTRIES = 1 << 26 # Largest packed index space built, 64 MB of distances
+
+    def __init__(self, board: Board, distances: np.ndarray = None):
+        """Initializes the DistanceTable.
+
+        Args:
+            board (Board): The board of the level.
+            distances (np.ndarray, optional): The distances by packed index. Defaults to None,
+                for a table where every state is unsolvable.
+
+        Raises:
+            ValueError: If the packed index space is larger than MAX_ENTRIES.
+        """
+        self.board = board
+        self.cells = sorted(board.open_cells, key=lambda pos: (pos[1], pos[0]))
+        self._cell_index = {pos: i for i, pos in enumerate(self.cells)}
+        # Tiles per color, equal to the targets per color in a valid level
+        counts = Counter(board.targets.values())
+        self.counts = tuple(counts[color] for color in board.colors)
+        self._radices = tuple(comb(len(self.cells), count) for count in self.counts)
+        size = prod(self._radices)
+        if size > self.MAX_ENTRIES:
+            raise ValueError(f"A distance table of {size} states is too large")
+        if distances is None:
+            distances = np.full(size, UNSOLVABLE, dtype=np.uint8)
+        self.distances = distances
+
+    @classmethod
+    def build(cls, board: Board) -> 'DistanceTable':
+        """Builds the table of a level by a retrograde breadth-first search from the goal.
+
+        Args:
+            board (Board): The board of the level.
+
+        Returns:
+            DistanceTable: The table.
+        """
+        table = cls(board)
+        distances = table.distances
+        goal_state = GameState(dict(board.targets), board=board)
+        distances[table.index(goal_state)] = 0
+        layer = [goal_state]
+        depth = 0
+        while layer:
+            depth += 1
+            next_layer = []
+            for state in layer:
+                for _, previous_state in predecessors(state):
+                    index = table.index(previous_state)
+                    if distances[index] == UNSOLVABLE:
+                        if depth >= UNSOLVABLE:
+                            raise ValueError(f"A distance of {depth} moves does not fit the table")
+                        distances[index] = depth
+                        next_layer.append(previous_state)
+            layer = next_layer
+        return table
+
+    def index(self, state: GameState) -> int:
+        """Computes the packed index of a state.
+
+        Args:
+            state (GameState): The state.
+
+        Returns:
+            int: The index of the state in the table.
+        """
+        cells_by_color = [[] for _ in self.counts]
+        color_index = self.board.color_index
+        for pos, color in state.tiles.items():
+            cells_by_color[color_index[color]].append(self._cell_index[pos])
+        index = 0
+        for cells, radix in zip(cells_by_color, self._radices):
+            # Rank of the combination in the combinatorial number system
+            rank = 0
+            for count, cell in enumerate(sorted(cells), 1):
+                rank += comb(cell, count)
+            index = index * radix + rank
+        return index
+
+    def distance(self, state: GameState) -> Optional[int]:
+        """Looks up the number of moves of an optimal solution from a state.
+
+        Args:
+            state (GameState): The state.
+
+        Returns:
+            Optional[int]: The number of moves, or None if the state cannot be solved.
+        """
+        distance = int(self.distances[self.index(state)])
+        return None if distance == UNSOLVABLE else distance
+
+    def is_solvable(self, state: GameState) -> bool:
+        """Tells whether the goal can still be reached from a state.
+
+        Args:
+            state (GameState): The state.
+
+        Returns:
+            bool: True if the state can be solved, False otherwise.
+        """
+        return self.distances[self.index(state)] != UNSOLVABLE
+
+    def is_optimal_move(self, state: GameState, next_state: GameState) -> bool:
+        """Tells whether a move is the first move of an optimal solution.
+
+        Args:
+            state (GameState): The state before the move.
+            next_state (GameState): The state after the move.
+
+        Returns:
+            bool: True if the move brings the state one move closer to the goal, False otherwise.
+        """
+        distance = self.distance(state)
+        return distance is not None and self.distance(next_state) == distance - 1
+
+    def best_move(self, state: GameState) -> Optional[str]:
+        """Finds the first move of an optimal solution.
+
+        Args:
+            state (GameState): The state.
+
+        Returns:
+            Optional[str]: The name of the move, or None if the state is solved or cannot be solved.
+        """
+        distance = self.distance(state)
+        if not distance:
+            return None
+        for move_code, next_state, _ in generate_successors(state):
+            if self.distance(next_state) == distance - 1:
+                return type(POSSIBLE_MOVES[move_code]).__name__
+        return None
+
+    def _signature(self) -> np.ndarray:
+        """Encodes the open cells and targets, telling whether a saved table belongs to the board."""
+        size = self.board.size
+        return np.array([pos[1] * size + pos[0] for pos in self.cells]
+                        + [-1]
+                        + [(pos[1] * size + pos[0]) * len(self.board.colors) + self.board.color_index[color]
+                           for pos, color in sorted(self.board.targets.items())], dtype=np.int32)
+
+    def save(self, file_path: str):
+        """Saves the table.
+
+        Args:
+            file_path (str): The path of the .npz file.
+        """
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Written aside and then renamed, so that an interrupted save never leaves a truncated table
+        temporary_path = file_path + ".tmp.npz"
+        np.savez_compressed(temporary_path, distances=self.distances, signature=self._signature())
+        os.replace(temporary_path, file_path)
+
+    @classmethod
+    def load(cls, file_path: str, board: Board) -> Optional['DistanceTable']:
+        """Loads a saved table.
+
+        Args:
+            file_path (str): The path of the .npz file.
+            board (Board): The board of the level.
+
+        Returns:
+            Optional[DistanceTable]: The table, or None if there is no saved table for this board.
+        """
+        if not os.path.exists(file_path):
+            return None
+        table = cls(board)
+        with np.load(file_path, allow_pickle=False) as data:
+            if not np.array_equal(data["signature"], table._signature()) \
+                    or len(data["distances"]) != len(table.distances):
+                return None
+            table.distances = data["distances"]
+        return table
@@ -6,9 +6,9 @@ import math
 import pygame_menu.themes
 
 # Import game modules
-from game_state import GameState
 from level_manager import LevelManager
-from move import POSSIBLE_MOVES, SlideDown, SlideLeft, SlideRight, SlideUp
+from move import SlideDown, SlideLeft, SlideRight, SlideUp
+from search_algorithm import BFS
 
 # Initialize pygame
 pygame.init()
@@ -19,6 +19,7 @@ WINDOW_HEIGHT = 600
 FPS = 60
 CELL_PADDING = 0
 HINT_DURATION = 2500  # 4 seconds in milliseconds
+HINT_SEARCH_INTERVAL = 2000  # States expanded by the hint search per frame
 SIDE_MARGIN = 50  # Added side margin constant
 
 # Colors
@@ -66,6 +67,11 @@ class GameGUI:
         self.hint_arrow = None
         self.hint_start_time = 0
         self.hint_direction = None
+        # Hint search running in the background, advanced once per frame
+        self.hint_solver = None
+        self.hint_search = None
+        self.hint_search_state = None
+        self.hint_progress = None
         self.running = True
         self.in_game = False
         self.menu = None
@@ -265,6 +271,8 @@ class GameGUI:
         self.optimal_moves = self.current_level.optimal_moves
         self.moves_count = 0
         self.in_game = True
+        # Built in the background so that hints can use it once it is ready
+        self.level_manager.request_distance_table(self.current_level_index, self.current_level)
     
     def filter_levels_by_size(self):
         """Get a list of available levels for the current board size."""
@@ -295,8 +303,11 @@ class GameGUI:
         self.optimal_moves = self.current_level.optimal_moves
         self.moves_count = 0
         self.in_game = True
+        # Built in the background so that hints can use it once it is ready
+        self.level_manager.request_distance_table(self.current_level_index, self.current_level)
         
     def game_loop(self):
+        self.advance_hint_search()
         # Draw game
         self.draw_game()
         pygame.display.flip()
@@ -489,6 +500,11 @@ class GameGUI:
         else:
             self.hint_arrow = None
             self.hint_direction = None
+
+        if self.hint_search is not None and self.hint_progress is not None:
+            searching_text = self.small_font.render(
+                f"Searching... {self.hint_progress.states_expanded} states", True, BLACK)
+            self.screen.blit(searching_text, (self.window_width / 2 + 20, WINDOW_HEIGHT - 38))
     
     def draw_hint_animation(self, board_offset_x, board_offset_y, tile_size, board_size):
         """Draw animated hint arrow."""
@@ -584,35 +600,49 @@ class GameGUI:
             pygame.draw.rect(self.screen, WHITE, shaft_rect, 3)
     
     def show_hint(self):
-        """Show a hint for the next move."""
-        hint = self._first_move_bfs(self.current_state)
-        if hint:
-            self.hint_direction = hint
-            self.hint_arrow = True
-            self.hint_start_time = pygame.time.get_ticks()
-    
-    def _first_move_bfs(self, state: GameState):
-        """Performs a breadth-first search to find the first move in the solution."""
-        problem = deepcopy(state)
-        queue = [(problem, [])]
-        visited_hashes = set()
-        visited_hashes.add(hash(problem))
-
-        while queue:
-            current_state, path = queue.pop(0)
-
-            if current_state.is_solved():
-                return path[0] if path else None
-
-            for move in POSSIBLE_MOVES:
-                next_state = move.apply(current_state)
-                if next_state:
-                    next_state_hash = hash(next_state)
-                    if next_state_hash not in visited_hashes:
-                        visited_hashes.add(next_state_hash)
-                        queue.append((next_state, path + [type(move).__name__]))
-
-        return None
+        """Show a hint for the next move.
+
+        The move is looked up in the distance table of the level. While the
+        table is still being built, or if the level is too large for one, a
+        search is started instead, and the hint is shown once it finishes.
+        """
+        self.cancel_hint_search()
+        distance_table = self.level_manager.request_distance_table(self.current_level_index, self.current_level)
+        if distance_table is not None:
+            hint = distance_table.best_move(self.current_state)
+            if hint:
+                self.hint_direction = hint
+                self.hint_arrow = True
+                self.hint_start_time = pygame.time.get_ticks()
+            return
+        self.hint_solver = BFS(self.current_state)
+        self.hint_search = self.hint_solver.solve_iter(HINT_SEARCH_INTERVAL)
+        self.hint_search_state = self.current_state
+        self.hint_progress = None
+
+    def advance_hint_search(self):
+        """Advance the hint search by one step, showing the hint when it finishes."""
+        if self.hint_search is None:
+            return
+        if self.hint_search_state is not self.current_state:
+            # The board changed since the hint was requested
+            self.cancel_hint_search()
+            return
+        try:
+            self.hint_progress = next(self.hint_search)
+        except StopIteration:
+            result = self.hint_solver.result
+            self.hint_search = None
+            if result.solution:
+                self.hint_direction = result.solution[0]
+                self.hint_arrow = True
+                self.hint_start_time = pygame.time.get_ticks()
+
+    def cancel_hint_search(self):
+        """Stop the running hint search, if any."""
+        if self.hint_search is not None:
+            self.hint_search.close()
+            self.hint_search = None
     
     def undo_move(self):
         """Undo the last move if there is a move history."""
@@ -1,24 +1,50 @@
-from typing import Dict, List, Tuple
+from typing import Dict, FrozenSet, List, Tuple
+
+from board import Board
 
 
 class GameState:
-    def __init__(self, tiles: Dict[Tuple[int, int], str], targets: Dict[Tuple[int, int], str],
-                 blanks: List[Tuple[int, int]], blockers: List[Tuple[int, int]], size: int):
+    __slots__ = ("board", "tiles", "_key", "_zobrist")
+
+    def __init__(self, tiles: Dict[Tuple[int, int], str], targets: Dict[Tuple[int, int], str] = None,
+                 blanks: List[Tuple[int, int]] = None, blockers: List[Tuple[int, int]] = None,
+                 size: int = None, board: Board = None):
         """Initializes the GameState.
 
+        Only the tiles are stored per state. The rest of the layout lives in a
+        Board shared by all states of a level, which is built from targets,
+        blanks, blockers and size unless an existing board is passed.
+
         Args:
             tiles (Dict[Tuple[int, int], str]): The positions and colors of the tiles.
-            targets (Dict[Tuple[int, int], str]): The positions and colors of the targets.
-            blanks (List[Tuple[int, int]]): The positions of the blank spaces.
-            blockers (List[Tuple[int, int]]): The positions of the blockers.
-            size (int): The size of the game board.
+            targets (Dict[Tuple[int, int], str], optional): The positions and colors of the targets.
+            blanks (List[Tuple[int, int]], optional): The positions of the blank spaces.
+            blockers (List[Tuple[int, int]], optional): The positions of the blockers.
+            size (int, optional): The size of the game board.
+            board (Board, optional): The shared layout of the level. Defaults to None.
         """
+        if board is None:
+            board = Board(targets, blockers, list(blanks) + list(targets) + list(tiles), size)
+        self.board = board
         self.tiles = tiles
-        self.targets = targets
-        self.blanks = blanks
-        self.blockers = blockers
-        self.size = size
-        self.move_history = []
+        self._key = None
+        self._zobrist = None
+
+    @property
+    def targets(self) -> Dict[Tuple[int, int], str]:
+        return self.board.targets
+
+    @property
+    def blockers(self) -> FrozenSet[Tuple[int, int]]:
+        return self.board.blockers
+
+    @property
+    def size(self) -> int:
+        return self.board.size
+
+    @property
+    def blanks(self) -> List[Tuple[int, int]]:
+        return self.board.blanks(self.tiles)
 
     def is_solved(self) -> bool:
         """Checks if all the tiles are placed in targets of corresponding color.
@@ -31,6 +57,94 @@ class GameState:
                 return False
         return True
 
+    def apply_moves(self, moves: List[Tuple[Tuple[int, int], Tuple[int, int]]]) -> 'GameState':
+        """Creates the state reached by moving tiles of this state.
+
+        The key and Zobrist hash of the new state are derived from those of
+        this state by XOR-ing out and in only the tiles that moved.
+
+        Args:
+            moves (List[Tuple[Tuple[int, int], Tuple[int, int]]]): The (from, to) positions of the
+                moving tiles, in an order where no tile moves onto a cell not yet left.
+
+        Returns:
+            GameState: The new state.
+        """
+        board = self.board
+        cell_codes = board.cell_codes
+        zobrist_keys = board.zobrist_keys
+        tiles = self.tiles.copy()
+        key = self.key()
+        zobrist = self.zobrist_hash()
+        for source, destination in moves:
+            color = tiles.pop(source)
+            tiles[destination] = color
+            key ^= cell_codes[source, color] ^ cell_codes[destination, color]
+            zobrist ^= zobrist_keys[source, color] ^ zobrist_keys[destination, color]
+        state = GameState.__new__(GameState)
+        state.board = board
+        state.tiles = tiles
+        state._key = key
+        state._zobrist = zobrist
+        return state
+
+    def key(self) -> int:
+        """Returns a canonical key of the tile occupancy.
+
+        Each cell takes a fixed number of bits holding 0 for no tile or the
+        1-based index of the tile color, so the key only depends on where the
+        tiles are and not on the order of the blanks list. It is cached on the state.
+
+        Returns:
+            int: The packed occupancy of the board.
+        """
+        if self._key is None:
+            cell_codes = self.board.cell_codes
+            key = 0
+            for item in self.tiles.items():
+                key |= cell_codes[item]
+            self._key = key
+        return self._key
+
+    @classmethod
+    def from_key(cls, board: Board, key: int) -> 'GameState':
+        """Creates the state whose canonical key is given.
+
+        Args:
+            board (Board): The board of the level.
+            key (int): A key returned by key() for a state on this board.
+
+        Returns:
+            GameState: The state with the tiles encoded in the key.
+        """
+        code_mask = (1 << board.key_bits) - 1
+        tiles = {}
+        for pos in board.open_cells:
+            code = (key >> (board.key_bits * (pos[1] * board.size + pos[0]))) & code_mask
+            if code:
+                tiles[pos] = board.colors[code - 1]
+        state = cls(tiles, board=board)
+        state._key = key
+        return state
+
+    def zobrist_hash(self) -> int:
+        """Returns the Zobrist hash of the tile occupancy.
+
+        The hash is the XOR of the random 64-bit keys of every (cell, color)
+        pair holding a tile. It is cached on the state, and states created by
+        apply_moves update it from the moved tiles only.
+
+        Returns:
+            int: The 64-bit hash.
+        """
+        if self._zobrist is None:
+            zobrist_keys = self.board.zobrist_keys
+            zobrist = 0
+            for item in self.tiles.items():
+                zobrist ^= zobrist_keys[item]
+            self._zobrist = zobrist
+        return self._zobrist
+
     def __eq__(self, other):
         """Checks if two GameState instances are equal.
 
@@ -41,10 +155,7 @@ class GameState:
             bool: True if the instances are equal, False otherwise.
         """
         if isinstance(other, GameState):
-            return (self.tiles == other.tiles and
-                    self.targets == other.targets and
-                    self.blanks == other.blanks and
-                    self.blockers == other.blockers)
+            return self.tiles == other.tiles and self.board == other.board
         return False
 
     def __hash__(self):
@@ -53,7 +164,7 @@ class GameState:
         Returns:
             int: The hash value of the instance.
         """
-        return hash((frozenset(self.tiles.items()), tuple(self.blanks)))
+        return self.zobrist_hash()
 
     def __str__(self):
         """Returns the string representation of the GameState instance.
@@ -1,18 +1,27 @@
 from abc import ABC, abstractmethod
-from itertools import permutations
 
+import numpy as np
+
+from assignment import min_max_assignment, min_sum_assignment
 from game_state import GameState
+from pattern_database import PatternDatabase
+from slide_distances import SlideDistances
 
 
 class Heuristic(ABC):
+    admissible = False # Whether the heuristic never overestimates the moves left, making A* and IDA* optimal
+
     @abstractmethod
     def evaluate(self, state: GameState) -> int:
         """Evaluates the heuristic for the given game state."""
         pass
 
 class MinMovesHeuristic(Heuristic):
-    """Base class for heuristics that calculate moves between tiles and targets."""
-    MAX_TILES_PER_COLOR = 5 # We limit the number of tiles in permutational calculations, otherwise greedy approach is used
+    """Base class for heuristics that calculate moves between tiles and targets.
+
+    The tiles of each color are assigned to distinct targets of that color,
+    choosing the assignment optimal for the aggregation of the subclass.
+    """
 
     def evaluate(self, state: GameState) -> int:
         """Evaluates the heuristic for the given game state.
@@ -39,66 +48,11 @@ class MinMovesHeuristic(Heuristic):
         tiles = [pos for pos, col in state.tiles.items() if col == color]
         targets = [pos for pos, col in state.targets.items() if col == color]
 
-        if len(tiles) > self.MAX_TILES_PER_COLOR:
-            return self._simple_calculation(tiles, targets, state.blockers, state.tiles, state.targets)
-        return self._permutational_calculation(tiles, targets, state.blockers, state.tiles, state.targets)
-
-    def _simple_calculation(self, tiles: list, targets: list, blockers: list = None, tiles_dict: dict = None, targets_dict: dict = None) -> int:
-        """Performs a simple calculation for the heuristic.
-
-        Args:
-            tiles (list): List of tile positions.
-            targets (list): List of target positions.
-            blockers (list, optional): List of blocker positions. Defaults to None.
-            tiles_dict (dict, optional): Dictionary of tile positions and colors. Defaults to None.
-            targets_dict (dict, optional): Dictionary of target positions and colors. Defaults to None.
-
-        Returns:
-            int: The heuristic value.
-        """
-        used_targets = set()
-        result = 0
-
-        for tile_pos in tiles:
-            min_moves = 4 # Maximum possible number of moves for every heuristic is 3, we go 1 over
-            best_target = None
-            
-            for target_pos in targets:
-                if target_pos not in used_targets:
-                    moves = self._calculate_moves(tile_pos, target_pos, blockers, tiles_dict, targets_dict)
-                    if moves < min_moves:
-                        min_moves = moves
-                        best_target = target_pos
-                        
-            if best_target:
-                used_targets.add(best_target)
-            result = self._update_partial(result, min_moves)
-            
-        return result
-
-    def _permutational_calculation(self, tiles: list, targets: list, blockers: list = None, tiles_dict: dict = None, targets_dict: dict = None) -> int:
-        """Performs a permutational calculation for the heuristic.
-
-        Args:
-            tiles (list): List of tile positions.
-            targets (list): List of target positions.
-            blockers (list, optional): List of blocker positions. Defaults to None.
-            tiles_dict (dict, optional): Dictionary of tile positions and colors. Defaults to None.
-            targets_dict (dict, optional): Dictionary of target positions and colors. Defaults to None.
-
-        Returns:
-            int: The heuristic value.
-        """
-        best_result = self._init_best(len(tiles))
-        
-        for target_arrangement in permutations(targets):
-            current = 0
-            for tile_pos, target_pos in zip(tiles, target_arrangement):
-                moves = self._calculate_moves(tile_pos, target_pos, blockers, tiles_dict, targets_dict)
-                current = self._update_partial(current, moves)
-            best_result = min(best_result, current)
-            
-        return best_result
+        if len(tiles) == 1:
+            return self._calculate_moves(tiles[0], targets[0], state.blockers, state.tiles, state.targets)
+        costs = np.array([[self._calculate_moves(tile_pos, target_pos, state.blockers, state.tiles, state.targets)
+                           for target_pos in targets] for tile_pos in tiles])
+        return self._assignment_cost(costs)
 
     @abstractmethod
     def _calculate_moves(self, tile_pos: tuple, target_pos: tuple, blockers: list = None, tiles_dict: dict = None, targets_dict = None) -> int:
@@ -117,27 +71,14 @@ class MinMovesHeuristic(Heuristic):
         pass
 
     @abstractmethod
-    def _init_best(self, len_tiles) -> int:
-        """Initializes value for best result.
-
-        Args:
-            len_tiles (int): The number of tiles.
-
-        Returns:
-            int: The initial best result value.
-        """
-        pass
-
-    @abstractmethod
-    def _update_partial(self, current: int, new: int) -> int:
-        """Updates partial result with new value.
+    def _assignment_cost(self, costs: np.ndarray) -> int:
+        """Calculates the cost of the best assignment of tiles to targets.
 
         Args:
-            current (int): The current partial result.
-            new (int): The new value to update with.
+            costs (np.ndarray): The moves from every tile (rows) to every target (columns) of a color.
 
         Returns:
-            int: The updated partial result.
+            int: The cost of the best assignment.
         """
         pass
 
@@ -154,28 +95,16 @@ class MinMovesHeuristic(Heuristic):
         pass
 
 class SumMinMoves(MinMovesHeuristic):
-    def _init_best(self, len_tiles: int) -> int:
-        """Initializes value for best result.
+    def _assignment_cost(self, costs: np.ndarray) -> int:
+        """Calculates the smallest total of moves over the assignments, with the Hungarian algorithm.
 
         Args:
-            len_tiles (int): The number of tiles.
+            costs (np.ndarray): The moves from every tile (rows) to every target (columns) of a color.
 
         Returns:
-            int: The initial best result value.
+            int: The cost of the best assignment.
         """
-        return 3 * len_tiles + 1
-
-    def _update_partial(self, current: int, new: int) -> int:
-        """Updates partial result with new value.
-
-        Args:
-            current (int): The current partial result.
-            new (int): The new value to update with.
-
-        Returns:
-            int: The updated partial result.
-        """
-        return current + new
+        return min_sum_assignment(costs)
 
     def _aggregate_results(self, results: list) -> int:
         """Aggregates results from all color groups.
@@ -189,28 +118,16 @@ class SumMinMoves(MinMovesHeuristic):
         return sum(results)
 
 class MaxMinMoves(MinMovesHeuristic):
-    def _init_best(self, len_tiles: int = None) -> int:
-        """Initializes value for best result.
-
-        Args:
-            len_tiles (int, optional): The number of tiles. Defaults to None.
-
-        Returns:
-            int: The initial best result value.
-        """
-        return 4
-
-    def _update_partial(self, current: int, new: int) -> int:
-        """Updates partial result with new value.
+    def _assignment_cost(self, costs: np.ndarray) -> int:
+        """Calculates the smallest largest number of moves over the assignments, as a bottleneck assignment.
 
         Args:
-            current (int): The current partial result.
-            new (int): The new value to update with.
+            costs (np.ndarray): The moves from every tile (rows) to every target (columns) of a color.
 
         Returns:
-            int: The updated partial result.
+            int: The cost of the best assignment.
         """
-        return max(current, new)
+        return min_max_assignment(costs)
 
     def _aggregate_results(self, results: list) -> int:
         """Aggregates results from all color groups.
@@ -249,7 +166,7 @@ class SumMinMovesTeleport(TeleportMoves, SumMinMoves):
 
 class MaxMinMovesTeleport(TeleportMoves, MaxMinMoves):
     """Calculates maximum of minimum moves needed using teleport movement."""
-    pass
+    admissible = True
 
 class BlockerMoves:
     def _calculate_moves(self, tile_pos: tuple, target_pos: tuple, blockers: list, tiles_dict: dict = None, targets_dict: dict = None) -> int:
@@ -320,7 +237,7 @@ class SumMinMovesBlockers(BlockerMoves, SumMinMoves):
 
 class MaxMinMovesBlockers(BlockerMoves, MaxMinMoves):
     """Calculates maximum of minimum moves needed considering blockers."""
-    pass
+    admissible = True
 
 class ConflictMoves:
     def _calculate_moves(self, tile_pos: tuple, target_pos: tuple, blockers: list, tiles_dict: dict, targets_dict: dict) -> int:
@@ -371,10 +288,90 @@ class ConflictMoves:
 
         return 2
 
+class SlideMoves:
+    """Reads the number of moves between a tile and a target from the SlideDistances of the level."""
+    _board = None
+    _slide_distances = None
+
+    def evaluate(self, state: GameState) -> int:
+        """Evaluates the heuristic, computing the slide distances the first time a level is seen.
+
+        Args:
+            state (GameState): The current game state.
+
+        Returns:
+            int: The heuristic value.
+        """
+        if state.board is not self._board:
+            self._slide_distances = SlideDistances(state.board)
+            self._board = state.board
+        return super().evaluate(state)
+
+    def _calculate_moves(self, tile_pos: tuple, target_pos: tuple, blockers: list = None, tiles_dict: dict = None, targets_dict: dict = None) -> int:
+        """Looks up the number of moves between a tile and a target in the slide distances.
+
+        Args:
+            tile_pos (tuple): The position of the tile.
+            target_pos (tuple): The position of the target.
+            blockers (list, optional): List of blocker positions. Defaults to None.
+            tiles_dict (dict, optional): Dictionary of tile positions and colors. Defaults to None.
+            targets_dict (dict, optional): Dictionary of target positions and colors. Defaults to None.
+
+        Returns:
+            int: The number of moves.
+        """
+        return self._slide_distances.distance(tile_pos, target_pos)
+
+class SumMinMovesSlides(SlideMoves, SumMinMoves):
+    """Calculates sum of minimum moves needed using exact single-tile slide distances."""
+    pass
+
+class MaxMinMovesSlides(SlideMoves, MaxMinMoves):
+    """Calculates maximum of minimum moves needed using exact single-tile slide distances."""
+    admissible = True
+
 class SumMinMovesConflicts(ConflictMoves, SumMinMoves):
     """Calculates sum of minimum moves needed considering other color tiles as blockers."""
     pass
 
 class MaxMinMovesConflicts(ConflictMoves, MaxMinMoves):
     """Calculates maximum of minimum moves needed considering other color tiles as blockers."""
-    pass
\ No newline at end of file
+    pass
+
+class MaxPatternDatabases(Heuristic):
+    """Calculates maximum over the colors of the exact costs of one-color abstractions.
+
+    One PatternDatabase per color is built the first time a state of a level
+    is evaluated, after which every evaluation is one lookup per color. Colors
+    whose abstraction is too large for a database are bounded by the slide
+    distances of MaxMinMovesSlides instead, which keeps the maximum admissible.
+    """
+    admissible = True
+
+    def __init__(self):
+        self._board = None
+        self._databases = []
+        self._fallback = None # MaxMinMovesSlides, used when the database of some color is too large
+
+    def evaluate(self, state: GameState) -> int:
+        """Evaluates the heuristic for the given game state.
+
+        Args:
+            state (GameState): The current game state.
+
+        Returns:
+            int: The heuristic value.
+        """
+        if state.board is not self._board:
+            self._databases = []
+            self._fallback = None
+            for color in state.board.colors:
+                try:
+                    self._databases.append(PatternDatabase(state.board, color))
+                except ValueError:
+                    self._fallback = MaxMinMovesSlides()
+            self._board = state.board
+        value = max((database.evaluate(state) for database in self._databases), default=0)
+        if self._fallback is not None:
+            value = max(value, self._fallback.evaluate(state))
+        return value
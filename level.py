@@ -4,12 +4,16 @@ from game_state import GameState
 class Level:
     """Represents a game level with an initial state and optimal moves."""
 
-    def __init__(self, initial_state: GameState, optimal_moves: int):
+    def __init__(self, initial_state: GameState, optimal_moves: int, file_path: str = None):
         """Initializes a Level instance.
 
         Args:
             initial_state (GameState): The initial state of the level.
             optimal_moves (int): The optimal number of moves to solve the level.
+            file_path (str, optional): The file the level was loaded from. Defaults to None.
         """
         self.initial_state = initial_state
-        self.optimal_moves = optimal_moves
\ No newline at end of file
+        self.board = initial_state.board
+        self.optimal_moves = optimal_moves
+        self.file_path = file_path
+        self.distance_table = None # DistanceTable, loaded on demand by the LevelManager
\ No newline at end of file
@@ -1,16 +1,21 @@
+import hashlib
 import os
 import random
 import re
+import threading
 from typing import Dict, List, Optional, Tuple
 
 from sortedcontainers import SortedDict
 
+from distance_table import DistanceTable
 from game_state import GameState
 from level import Level
 from level_validator import LevelValidator
 
 
 class LevelManager:
+    # Distance tables of all levels are saved here
+    DISTANCE_TABLE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "distance_tables")
     PREDEFINED_LEVELS = {
         1: [Level(
             GameState(
@@ -294,6 +299,8 @@ class LevelManager:
         """
         self.validator = LevelValidator()
         self.levels = SortedDict(self.PREDEFINED_LEVELS)
+        self._distance_table_builds = set() # ids of the levels whose table is built in the background
+        self._distance_table_lock = threading.Lock()
         if levels:
             for k, v in levels.items():
                 if k in self.levels:
@@ -341,6 +348,76 @@ class LevelManager:
         """
         return sorted(self.levels.keys())
 
+    def get_distance_table(self, level_index: int, level: Level) -> Optional[DistanceTable]:
+        """Gets the table of exact distances to the goal of a level.
+
+        The table is loaded from disk if it was saved before, and otherwise
+        built and saved for the next time.
+
+        Args:
+            level_index (int): The index of the level.
+            level (Level): The level.
+
+        Returns:
+            Optional[DistanceTable]: The table, or None if the level has too many states for one.
+        """
+        if level.distance_table is None:
+            file_path = self._distance_table_path(level_index, level)
+            try:
+                table = DistanceTable.load(file_path, level.board)
+                if table is None:
+                    table = DistanceTable.build(level.board)
+                    try:
+                        table.save(file_path)
+                    except OSError as e:
+                        print(f"Error! Did not manage to save the distance table to {file_path}: {e}")
+            except ValueError:
+                return None
+            level.distance_table = table
+        return level.distance_table
+
+    def request_distance_table(self, level_index: int, level: Level) -> Optional[DistanceTable]:
+        """Gets the distance table of a level without waiting for it.
+
+        The first request loads or builds the table in a background thread,
+        so that building it does not freeze the game, and the table is
+        returned by the requests made once it is ready.
+
+        Args:
+            level_index (int): The index of the level.
+            level (Level): The level.
+
+        Returns:
+            Optional[DistanceTable]: The table, or None if it is not ready yet or the level has too
+                many states for one.
+        """
+        if level.distance_table is not None:
+            return level.distance_table
+        with self._distance_table_lock:
+            if id(level) not in self._distance_table_builds:
+                self._distance_table_builds.add(id(level))
+                threading.Thread(target=self.get_distance_table, args=(level_index, level), daemon=True).start()
+        return None
+
+    def _distance_table_path(self, level_index: int, level: Level) -> str:
+        """Gets the path the distance table of a level is saved at.
+
+        Args:
+            level_index (int): The index of the level.
+            level (Level): The level.
+
+        Returns:
+            str: The path of the table file.
+        """
+        if level.file_path:
+            # The hash of the full path tells apart level files of the same name
+            name = os.path.splitext(os.path.basename(level.file_path))[0]
+            digest = hashlib.sha1(os.path.abspath(level.file_path).encode()).hexdigest()[:8]
+            return os.path.join(self.DISTANCE_TABLE_DIRECTORY, f"file_{name}_{digest}.npz")
+        variants = self.levels.get(level_index, [])
+        variant = next((i for i, other in enumerate(variants) if other is level), 0)
+        return os.path.join(self.DISTANCE_TABLE_DIRECTORY, f"level_{level_index}_{variant}.npz")
+
     def add_level(self, level_index: int, level: Level):
         """Adds a new level to the manager.
 
@@ -398,7 +475,7 @@ class LevelManager:
 
         game_state = GameState(tiles=tiles, targets=targets, blanks=blanks, blockers=blockers, size=size)
         print(game_state)
-        level = Level(initial_state=game_state, optimal_moves=read_optimal_moves)
+        level = Level(initial_state=game_state, optimal_moves=read_optimal_moves, file_path=file_path)
         if not self.validator.validate_level(level):
             return
 
@@ -1,7 +1,7 @@
 from copy import deepcopy
 
 from level import Level
-from search_algorithm import BFS
+from search_algorithm import ExternalBFS
 
 
 class LevelValidator:
@@ -95,13 +95,16 @@ class LevelValidator:
     def _find_optimal_solution(self, level: Level) -> int:
         """Finds the optimal number of moves to solve the level using BFS.
 
+        The layers of the search are kept on disk, so optimality can also be
+        proven for levels whose state space does not fit in memory.
+
         Args:
             level (Level): The level to solve.
 
         Returns:
             int: The optimal number of moves to solve the level, or None if no solution exists.
         """
-        bfs = BFS(deepcopy(level.initial_state))
+        bfs = ExternalBFS(deepcopy(level.initial_state))
         _, optimal_moves = bfs.solve()
         return optimal_moves if optimal_moves is not None else None
 
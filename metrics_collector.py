@@ -1,18 +1,56 @@
 import time
 import tracemalloc
+from typing import Callable, NamedTuple, Optional
+
+from search_budget import SearchBudget
+
+
+class ProgressSnapshot(NamedTuple):
+    """Progress of a running search."""
+    states_expanded: int
+    bound: Optional[float] # Current depth or f-value bound, if the search has one
+    frontier_size: Optional[int]
+    closed_size: Optional[int]
+    states_per_second: float
+    elapsed: float
 
 
 class MetricsCollector:
     """Collects and reports metrics for algorithm performance."""
 
-    def __init__(self):
+    def __init__(self, budget: SearchBudget = None):
+        """Initializes the MetricsCollector.
+
+        Args:
+            budget (SearchBudget, optional): Limits checked every time a state is tracked. Defaults to None.
+        """
+        self.budget = budget
         self.start_time = 0
         self.end_time = 0
         self.max_memory = 0
         self.states_generated = 0
+        self.duplicates_pruned = 0
+        self.states_reopened = 0
+        self.stale_entries_skipped = 0
+        # Containers and bound of the running search, read when a progress snapshot is taken
+        self.frontier = None
+        self.closed = None
+        self.bound = None
+        self.progress_callback = None
+        self.progress_interval = 0
+        self._next_progress = 0
 
     def start(self):
-        """Starts the metrics collection."""
+        """Starts the metrics collection, discarding the counts of any earlier run."""
+        self.max_memory = 0
+        self.states_generated = 0
+        self.duplicates_pruned = 0
+        self.states_reopened = 0
+        self.stale_entries_skipped = 0
+        self.frontier = None
+        self.closed = None
+        self.bound = None
+        self._next_progress = self.progress_interval
         self.start_time = time.time()
         tracemalloc.start()
 
@@ -21,11 +59,92 @@ class MetricsCollector:
         self.end_time = time.time()
         tracemalloc.stop()
 
-    def track_state(self):
-        """Tracks the memory usage and state generation."""
-        self.states_generated += 1
+    def track_state(self, count: int = 1):
+        """Tracks the memory usage and state generation.
+
+        Args:
+            count (int, optional): The number of states generated. Defaults to 1.
+
+        Raises:
+            SearchInterrupted: If the search was cancelled or exceeded its budget.
+        """
+        self.states_generated += count
         current_memory, _ = tracemalloc.get_traced_memory()
         self.max_memory = max(self.max_memory, current_memory)
+        if self.progress_callback is not None and self.states_generated >= self._next_progress:
+            self._next_progress = self.states_generated + self.progress_interval
+            self.progress_callback(self.snapshot())
+        if self.budget is not None:
+            self.budget.check(self.states_generated, self.start_time, current_memory)
+
+    def track_search(self, frontier=None, closed=None):
+        """Registers the containers of the running search for progress snapshots.
+
+        Args:
+            frontier (optional): The states waiting to be expanded, anything supporting len().
+            closed (optional): The states already reached, anything supporting len().
+        """
+        self.frontier = frontier
+        self.closed = closed
+
+    def track_bound(self, bound: float):
+        """Tracks the current depth or f-value bound of the search.
+
+        Args:
+            bound (float): The bound.
+        """
+        self.bound = bound
+
+    def set_progress(self, callback: Optional[Callable[[ProgressSnapshot], None]], interval: int = 1000):
+        """Sets a function called with a snapshot every given number of tracked states.
+
+        Args:
+            callback (Optional[Callable[[ProgressSnapshot], None]]): The function, or None to stop reporting.
+            interval (int, optional): The number of states between snapshots. Defaults to 1000.
+        """
+        self.progress_callback = callback
+        self.progress_interval = interval
+        self._next_progress = self.states_generated + interval
+
+    def snapshot(self) -> ProgressSnapshot:
+        """Takes a snapshot of the progress of the running search.
+
+        Returns:
+            ProgressSnapshot: The current progress.
+        """
+        elapsed = time.time() - self.start_time
+        return ProgressSnapshot(
+            states_expanded=self.states_generated,
+            bound=self.bound,
+            frontier_size=len(self.frontier) if self.frontier is not None else None,
+            closed_size=len(self.closed) if self.closed is not None else None,
+            states_per_second=self.states_generated / elapsed if elapsed > 0 else 0.0,
+            elapsed=elapsed
+        )
+
+    def track_duplicate(self, count: int = 1):
+        """Tracks generated states discarded because they were already visited.
+
+        Args:
+            count (int, optional): The number of states discarded. Defaults to 1.
+        """
+        self.duplicates_pruned += count
+
+    def track_reopened(self, count: int = 1):
+        """Tracks already expanded states queued again because a cheaper path to them was found.
+
+        Args:
+            count (int, optional): The number of states reopened. Defaults to 1.
+        """
+        self.states_reopened += count
+
+    def track_stale(self, count: int = 1):
+        """Tracks queue entries skipped because their state was reached more cheaply since.
+
+        Args:
+            count (int, optional): The number of entries skipped. Defaults to 1.
+        """
+        self.stale_entries_skipped += count
 
     def get_metrics(self, solution_moves, optimal_moves):
         """Gets the collected metrics.
@@ -41,6 +160,9 @@ class MetricsCollector:
             "time": self.end_time - self.start_time,
             "memory": self.max_memory,
             "states_generated": self.states_generated,
+            "duplicates_pruned": self.duplicates_pruned,
+            "states_reopened": self.states_reopened,
+            "stale_entries_skipped": self.stale_entries_skipped,
             "solution_moves": solution_moves,
             "optimal_moves": optimal_moves,
             "difference_from_optimal": solution_moves - optimal_moves if solution_moves else None
@@ -76,4 +198,7 @@ class MetricsCollector:
         print(f"Time: {time_str}")
         print(f"Memory: {memory_str}")
         print(f"Number of states generated: {metrics['states_generated']}")
+        print(f"Number of duplicate states pruned: {metrics['duplicates_pruned']}")
+        print(f"Number of states reopened: {metrics['states_reopened']}")
+        print(f"Number of stale queue entries skipped: {metrics['stale_entries_skipped']}")
         print(f"Difference from optimal solution: {metrics['difference_from_optimal']}")
\ No newline at end of file
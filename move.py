@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
+from itertools import combinations, product
+from typing import Iterator, List, Optional, Tuple
 
+from bitboard import BitboardState
+from board import DOWN, LEFT, RIGHT, UP
 from game_state import GameState
 
 
@@ -19,144 +23,171 @@ class Move(ABC):
         pass
 
     def move(func):
-        """Decorator to handle move application and history tracking."""
+        """Decorator dispatching bitboard states to their own slides."""
         def wrapper(self, state: GameState):
-            new_state = GameState(state.tiles, state.targets, state.blanks, state.blockers, state.size)
-            new_state.move_history = state.move_history
-            value = func(self, new_state)
-            if value:
-                new_state.move_history.append(type(self).__name__)
-                return new_state
-            return None
+            if isinstance(state, BitboardState):
+                return state.slide(self.direction)
+            return func(self, state)
         return wrapper
 
+    def _slide(self, state: GameState) -> Optional[GameState]:
+        """Slides the tiles of a state line by line using the board's line transition tables.
+
+        Args:
+            state (GameState): The current game state.
+
+        Returns:
+            Optional[GameState]: The new game state, or None if no tile moved.
+        """
+        board = state.board
+        lines = board.lines[self.direction]
+        tables = board.line_tables[self.direction]
+        axis = board.line_axis[self.direction]
+        tiles = state.tiles
+        moves = []
+
+        for index in {pos[axis] for pos in tiles}:
+            contents = tuple(map(tiles.get, lines[index][0]))
+            line_moves = tables[index].get(contents)
+            if line_moves is None:
+                line_moves = board.line_moves(self.direction, index, contents)
+            moves.extend(line_moves)
+        if moves:
+            return state.apply_moves(moves)
+        return None
+
 class SlideLeft(Move):
     """Represents a slide left move."""
+    direction = LEFT
 
     @Move.move
     def apply(self, state: 'GameState') -> 'GameState':
-        new_tiles = state.tiles.copy()
-        new_blanks = state.blanks.copy()
-        moved = False
-        sorted_tiles = sorted(new_tiles.items(), key=lambda item: (item[0][0], item[0][1]))
-
-        for (x, y), color in sorted_tiles:
-            new_x, new_y = x, y
-            while (new_x - 1, new_y) in new_blanks or (new_x - 1, new_y) in state.targets:
-                if (new_x - 1, new_y) not in state.blockers and (new_x - 1, new_y) not in new_tiles:
-                    new_x -= 1
-                else:
-                    break
-            if new_x != x:
-                del new_tiles[(x, y)]
-                new_tiles[(new_x, new_y)] = color
-                if (x, y) not in state.targets:
-                    new_blanks.append((x, y))
-                if (new_x, new_y) not in state.targets:
-                    new_blanks.remove((new_x, new_y))
-                moved = True
-        if moved:
-            state.tiles = new_tiles
-            state.blanks = new_blanks
-            return True
-        else:
-            return False
+        return self._slide(state)
 
 class SlideRight(Move):
     """Represents a slide right move."""
+    direction = RIGHT
 
     @Move.move
     def apply(self, state: 'GameState') -> 'GameState':
-        new_tiles = state.tiles.copy()
-        new_blanks = state.blanks.copy()
-        moved = False
-        sorted_tiles = sorted(new_tiles.items(), key=lambda item: (item[0][0], item[0][1]), reverse=True)
-
-        for (x, y), color in sorted_tiles:
-            new_x, new_y = x, y
-            while (new_x + 1, new_y) in new_blanks or (new_x + 1, new_y) in state.targets:
-                if (new_x + 1, new_y) not in state.blockers and (new_x + 1, new_y) not in new_tiles:
-                    new_x += 1
-                else:
-                    break
-            if new_x != x:
-                del new_tiles[(x, y)]
-                new_tiles[(new_x, new_y)] = color
-                if (x, y) not in state.targets:
-                    new_blanks.append((x, y))
-                if (new_x, new_y) not in state.targets:
-                    new_blanks.remove((new_x, new_y))
-                moved = True
-        if moved:
-            state.tiles = new_tiles
-            state.blanks = new_blanks
-            return True
-        else:
-            return False
+        return self._slide(state)
 
 class SlideUp(Move):
     """Represents a slide up move."""
+    direction = UP
 
     @Move.move
     def apply(self, state: 'GameState') -> 'GameState':
-        new_tiles = state.tiles.copy()
-        new_blanks = state.blanks.copy()
-        moved = False
-        sorted_tiles = sorted(new_tiles.items(), key=lambda item: (item[0][1], item[0][0]))
-
-        for (x, y), color in sorted_tiles:
-            new_x, new_y = x, y
-            while (new_x, new_y - 1) in new_blanks or (new_x, new_y - 1) in state.targets:
-                if (new_x, new_y - 1) not in state.blockers and (new_x, new_y - 1) not in new_tiles:
-                    new_y -= 1
-                else:
-                    break
-            if new_y != y:
-                del new_tiles[(x, y)]
-                new_tiles[(new_x, new_y)] = color
-                if (x, y) not in state.targets:
-                    new_blanks.append((x, y))
-                if (new_x, new_y) not in state.targets:
-                    new_blanks.remove((new_x, new_y))
-                moved = True
-        if moved:
-            state.tiles = new_tiles
-            state.blanks = new_blanks
-            return True
-        else:
-            return False
+        return self._slide(state)
 
 class SlideDown(Move):
     """Represents a slide down move."""
+    direction = DOWN
 
     @Move.move
     def apply(self, state: 'GameState') -> 'GameState':
-        new_tiles = state.tiles.copy()
-        new_blanks = state.blanks.copy()
-        moved = False
-        sorted_tiles = sorted(new_tiles.items(), key=lambda item: (item[0][1], item[0][0]), reverse=True)
-
-        for (x, y), color in sorted_tiles:
-            new_x, new_y = x, y
-            while (new_x, new_y + 1) in new_blanks or (new_x, new_y + 1) in state.targets:
-                if (new_x, new_y + 1) not in state.blockers and (new_x, new_y + 1) not in new_tiles:
-                    new_y += 1
-                else:
+        return self._slide(state)
+
+
+POSSIBLE_MOVES = [SlideLeft(), SlideRight(), SlideUp(), SlideDown()]
+
+def generate_successors(state: GameState) -> List[Tuple[int, GameState, int]]:
+    """Applies all four slides to a state in one pass.
+
+    The occupancy of every row and column holding a tile is read once and
+    shared by the two slides along it. The key and Zobrist hash of each
+    successor are derived from those of the state by updating only the cells
+    of the tiles that moved.
+
+    Args:
+        state (GameState): The state to expand.
+
+    Returns:
+        List[Tuple[int, GameState, int]]: The index in POSSIBLE_MOVES, the new state and its key
+            for every slide that moved at least one tile.
+    """
+    if isinstance(state, BitboardState):
+        successors = []
+        for move_code, move in enumerate(POSSIBLE_MOVES):
+            next_state = state.slide(move.direction)
+            if next_state:
+                successors.append((move_code, next_state, next_state.key()))
+        return successors
+
+    board = state.board
+    tiles = state.tiles
+    rows = {}
+    columns = {}
+    for x, y in tiles:
+        if y not in rows:
+            rows[y] = tuple(map(tiles.get, board.lines[LEFT][y][0]))
+        if x not in columns:
+            columns[x] = tuple(map(tiles.get, board.lines[UP][x][0]))
+
+    successors = []
+    for move_code, (direction, line_contents, reverse) in enumerate((
+            (LEFT, rows, False), (RIGHT, rows, True), (UP, columns, False), (DOWN, columns, True))):
+        tables = board.line_tables[direction]
+        moves = []
+        for index, contents in line_contents.items():
+            if reverse:
+                contents = contents[::-1]
+            line_moves = tables[index].get(contents)
+            if line_moves is None:
+                line_moves = board.line_moves(direction, index, contents)
+            moves.extend(line_moves)
+        if moves:
+            next_state = state.apply_moves(moves)
+            successors.append((move_code, next_state, next_state.key()))
+    return successors
+
+
+def predecessors(state: GameState) -> Iterator[Tuple[int, GameState]]:
+    """Enumerates the states that slide into a state.
+
+    A slide packs the tiles of every segment of open cells against the end
+    the tiles move towards, keeping their order. A state can therefore only
+    be reached by a slide if all its segments along that slide are packed,
+    and its predecessors are then all the ways of spreading the tiles of each
+    segment back over the segment's cells in the same order, except for the
+    state itself.
+
+    Args:
+        state (GameState): The state to reach.
+
+    Yields:
+        Tuple[int, GameState]: The index in POSSIBLE_MOVES of the slide and a state it turns into
+            the given one.
+    """
+    board = state.board
+    tiles = state.tiles
+    for move_code, move in enumerate(POSSIBLE_MOVES):
+        # Per segment holding tiles, the alternative tile moves to undo the slide
+        segment_options = []
+        packed = True
+        for positions, open_flags in board.lines[move.direction]:
+            segment = []
+            for pos, is_open in zip(positions + (None,), open_flags + (False,)):
+                if is_open:
+                    segment.append(pos)
+                    continue
+                occupied = [cell in tiles for cell in segment]
+                count = sum(occupied)
+                if any(occupied[count:]):
+                    packed = False
                     break
-            if new_y != y:
-                del new_tiles[(x, y)]
-                new_tiles[(new_x, new_y)] = color
-                if (x, y) not in state.targets:
-                    new_blanks.append((x, y))
-                if (new_x, new_y) not in state.targets:
-                    new_blanks.remove((new_x, new_y))
-                moved = True
-        if moved:
-            state.tiles = new_tiles
-            state.blanks = new_blanks
-            return True
-        else:
-            return False
-
-
-POSSIBLE_MOVES = [SlideLeft(), SlideRight(), SlideUp(), SlideDown()]
\ No newline at end of file
+                if 0 < count < len(segment):
+                    # Tiles are moved back from the last one so that no tile lands on a cell not yet left
+                    segment_options.append([
+                        tuple((segment[i], segment[j]) for i, j in reversed(list(enumerate(spread))) if i != j)
+                        for spread in combinations(range(len(segment)), count)])
+                segment = []
+            if not packed:
+                break
+        if not packed:
+            continue
+
+        for choice in product(*segment_options):
+            moves = [tile_move for segment_moves in choice for tile_move in segment_moves]
+            if moves:
+                yield move_code, state.apply_moves(moves)
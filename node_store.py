@@ -0,0 +1,61 @@
+from array import array
+from typing import List
+
+from move import POSSIBLE_MOVES
+
+
+class NodeStore:
+    """Arena of search tree nodes kept as parallel compact arrays.
+
+    A node is an index holding only its parent's index and the index in
+    POSSIBLE_MOVES of the move leading to it, so generating a child costs O(1)
+    instead of copying the whole path. Paths are rebuilt when a goal is found.
+    """
+    ROOT_PARENT = -1
+    NO_MOVE = -1
+
+    def __init__(self):
+        """Initializes the NodeStore with an empty arena."""
+        self.parents = array('q')
+        self.moves = array('b')
+
+    def add_root(self) -> int:
+        """Adds a node without parent.
+
+        Returns:
+            int: The index of the new node.
+        """
+        return self.add(self.ROOT_PARENT, self.NO_MOVE)
+
+    def add(self, parent: int, move_code: int) -> int:
+        """Adds a child node.
+
+        Args:
+            parent (int): The index of the parent node.
+            move_code (int): The index in POSSIBLE_MOVES of the move from the parent.
+
+        Returns:
+            int: The index of the new node.
+        """
+        self.parents.append(parent)
+        self.moves.append(move_code)
+        return len(self.moves) - 1
+
+    def path(self, node: int) -> List[str]:
+        """Rebuilds the moves leading from the root to a node.
+
+        Args:
+            node (int): The index of the node.
+
+        Returns:
+            List[str]: The names of the moves, from the root.
+        """
+        path = []
+        while self.parents[node] != self.ROOT_PARENT:
+            path.append(type(POSSIBLE_MOVES[self.moves[node]]).__name__)
+            node = self.parents[node]
+        path.reverse()
+        return path
+
+    def __len__(self) -> int:
+        return len(self.moves)
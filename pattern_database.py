@@ -0,0 +1,172 @@
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from board import Board
+from game_state import GameState
+from move import POSSIBLE_MOVES
+from vectorized_frontier import BLOCKED, EMPTY, slide_layer
+
+UNSOLVABLE = 255 # Cost stored for abstract states the goal cannot be reached from
+PATTERN = 1 # Cell code of the tiles of the database's color
+OTHER = 2 # Cell code of the tiles of every other color
+
+
+class PatternDatabase:
+    """Exact solution costs of the abstraction of a level keeping one color.
+
+    The abstraction keeps the tiles of one color and turns the tiles of all
+    other colors into anonymous tiles, and its goal is reached once the tiles
+    of the color are on their targets, wherever the other tiles are. The
+    other tiles are kept rather than removed because tiles stop against each
+    other: without them, a tile could need more moves than in the real game.
+    Slides do not depend on colors, so every solution of the level is also a
+    solution of the abstraction, and its cost is an admissible heuristic.
+
+    All abstract states are enumerated as NumPy grids, their successors are
+    computed with the vectorized slides of whole layers, and the costs are
+    filled in by a breadth-first search backwards from the goal states, one
+    depth at a time over the whole array. Costs are kept in a uint8 array
+    indexed like a DistanceTable, by the combination ranks of the cells of
+    the color and of the other tiles.
+    """
+    MAX_ENTRIES = 1 << 22 # Largest abstraction built, building it peaks at about 210 bytes per state
+
+    def __init__(self, board: Board, color: str):
+        """Initializes the PatternDatabase and computes its costs.
+
+        Args:
+            board (Board): The board of the level.
+            color (str): The color kept by the abstraction.
+
+        Raises:
+            ValueError: If the abstraction has more than MAX_ENTRIES states.
+        """
+        self.board = board
+        self.color = color
+        self.cells = sorted(board.open_cells, key=lambda pos: (pos[1], pos[0]))
+        self._cell_index = {pos: i for i, pos in enumerate(self.cells)}
+        self.pattern_count = sum(1 for target_color in board.targets.values() if target_color == color)
+        self.other_count = len(board.targets) - self.pattern_count
+        self._radix = comb(len(self.cells), self.other_count)
+        entries = comb(len(self.cells), self.pattern_count) * self._radix
+        if entries > self.MAX_ENTRIES:
+            raise ValueError(f"A pattern database of {entries} states is too large")
+        # binomials[cell][count] is the number of combinations of count cells among the first cell ones
+        self._binomials = [[comb(cell, count) for count in range(len(board.targets) + 1)]
+                           for cell in range(len(self.cells))]
+        self.costs = self._build(entries)
+
+    def index(self, state: GameState) -> int:
+        """Computes the index of the abstraction of a state.
+
+        Args:
+            state (GameState): The state.
+
+        Returns:
+            int: The index of the abstract state in the database.
+        """
+        pattern_cells = []
+        other_cells = []
+        for pos, color in state.tiles.items():
+            (pattern_cells if color == self.color else other_cells).append(self._cell_index[pos])
+        return self._rank(pattern_cells) * self._radix + self._rank(other_cells)
+
+    def _rank(self, cells: list) -> int:
+        """Ranks a combination of cells in the combinatorial number system."""
+        binomials = self._binomials
+        return sum(binomials[cell][count] for count, cell in enumerate(sorted(cells), 1))
+
+    def evaluate(self, state: GameState) -> int:
+        """Looks up the number of moves the abstraction of a state needs.
+
+        Args:
+            state (GameState): The state.
+
+        Returns:
+            int: The number of moves, or UNSOLVABLE if the state cannot be solved.
+        """
+        return int(self.costs[self.index(state)])
+
+    def _build(self, entries: int) -> np.ndarray:
+        """Computes the costs of all abstract states.
+
+        Args:
+            entries (int): The size of the index space.
+
+        Returns:
+            np.ndarray: The costs by index.
+        """
+        cell_count = len(self.cells)
+        pattern_cells = np.array(list(combinations(range(cell_count), self.pattern_count)),
+                                 dtype=np.int64).reshape(comb(cell_count, self.pattern_count), self.pattern_count)
+        other_cells = np.array(list(combinations(range(cell_count), self.other_count)),
+                               dtype=np.int64).reshape(self._radix, self.other_count)
+        pattern_cells = np.repeat(pattern_cells, len(other_cells), axis=0)
+        other_cells = np.tile(other_cells, (len(pattern_cells) // len(other_cells), 1))
+        disjoint = ~(pattern_cells[:, :, np.newaxis] == other_cells[:, np.newaxis, :]).any(axis=(1, 2))
+        pattern_cells, other_cells = pattern_cells[disjoint], other_cells[disjoint]
+        indexes = self._rank_layer(pattern_cells) * self._radix + self._rank_layer(other_cells)
+
+        size = self.board.size
+        flat_cells = np.array([y * size + x for x, y in self.cells], dtype=np.int64)
+        grids = np.full((len(indexes), size * size), BLOCKED, dtype=np.uint8)
+        grids[:, flat_cells] = EMPTY
+        rows = np.arange(len(indexes))[:, np.newaxis]
+        grids[rows, flat_cells[pattern_cells]] = PATTERN
+        grids[rows, flat_cells[other_cells]] = OTHER
+        grids = grids.reshape(-1, size, size)
+
+        # Index of the state every slide leads to, a slide moving nothing leads back to the state
+        successors = np.stack([self._layer_indexes(slide_layer(grids, move.direction)[0])
+                               for move in POSSIBLE_MOVES], axis=1)
+
+        targets = sorted(self._cell_index[pos] for pos, color in self.board.targets.items() if color == self.color)
+        goals = (pattern_cells == np.array(targets, dtype=np.int64)).all(axis=1)
+        costs = np.full(entries, UNSOLVABLE, dtype=np.uint8)
+        costs[indexes[goals]] = 0
+        remaining = ~goals
+        depth = 0
+        while remaining.any() and depth + 1 < UNSOLVABLE:
+            depth += 1
+            reached = remaining & (costs[successors] == depth - 1).any(axis=1)
+            if not reached.any():
+                break
+            costs[indexes[reached]] = depth
+            remaining &= ~reached
+        return costs
+
+    def _rank_layer(self, cells: np.ndarray) -> np.ndarray:
+        """Ranks every row of sorted cells in the combinatorial number system.
+
+        Args:
+            cells (np.ndarray): A (n, count) array of ascending cell indexes.
+
+        Returns:
+            np.ndarray: The n ranks.
+        """
+        binomials = np.array(self._binomials, dtype=np.int64)
+        ranks = np.zeros(len(cells), dtype=np.int64)
+        for count in range(cells.shape[1]):
+            ranks += binomials[cells[:, count], count + 1]
+        return ranks
+
+    def _layer_indexes(self, grids: np.ndarray) -> np.ndarray:
+        """Computes the index of every grid of a layer.
+
+        Args:
+            grids (np.ndarray): A (n, size, size) array of encoded grids.
+
+        Returns:
+            np.ndarray: The n indexes.
+        """
+        size = self.board.size
+        cell_of_flat = np.zeros(size * size, dtype=np.int64)
+        for i, (x, y) in enumerate(self.cells):
+            cell_of_flat[y * size + x] = i
+        flat = grids.reshape(len(grids), -1)
+        # Open cells are numbered in row-major order, so each row's cells come out ascending
+        pattern_cells = cell_of_flat[np.nonzero(flat == PATTERN)[1]].reshape(len(grids), self.pattern_count)
+        other_cells = cell_of_flat[np.nonzero(flat == OTHER)[1]].reshape(len(grids), self.other_count)
+        return self._rank_layer(pattern_cells) * self._radix + self._rank_layer(other_cells)
@@ -3,7 +3,8 @@ from copy import deepcopy
 from game_state import GameState
 from level import Level
 from level_manager import LevelManager
-from move import POSSIBLE_MOVES, SlideDown, SlideLeft, SlideRight, SlideUp
+from move import SlideDown, SlideLeft, SlideRight, SlideUp
+from search_algorithm import breadth_first_search
 
 
 class PlayGame:
@@ -18,6 +19,8 @@ class PlayGame:
         self.move_history = []
         self.running = True
         self.level_manager = level_manager
+        self.level_index = None
+        self.level = None
 
     def play_game(self, level_index: int, level: Level):
         """Starts the game for the specified level.
@@ -28,6 +31,10 @@ class PlayGame:
         """
         initial_state = deepcopy(level.initial_state)
         optimal_moves = level.optimal_moves
+        self.level_index = level_index
+        self.level = level
+        # Built in the background while the player starts playing
+        self.level_manager.request_distance_table(level_index, level)
         self._print_board(level_index, initial_state, "initial")
         i = 0
 
@@ -96,12 +103,18 @@ class PlayGame:
     def get_hint(self, state: GameState):
         """Gets a hint for the next move.
 
+        The move is looked up in the distance table of the level, or searched
+        for while the table is still being built or if the level has none.
+
         Args:
             state (GameState): The current game state.
 
         Returns:
             str: The next move as a hint.
         """
+        distance_table = self.level_manager.request_distance_table(self.level_index, self.level)
+        if distance_table is not None:
+            return distance_table.best_move(state)
         return self._first_move_bfs(state)
 
     def _first_move_bfs(self, state: GameState):
@@ -113,26 +126,8 @@ class PlayGame:
         Returns:
             str: The first move in the solution path.
         """
-        problem = deepcopy(state)
-        queue = [(problem, [])]
-        visited_hashes = set()
-        visited_hashes.add(hash(problem))
-
-        while queue:
-            current_state, path = queue.pop(0)
-
-            if current_state.is_solved():
-                return path[0]
-
-            for move in POSSIBLE_MOVES:
-                next_state = move.apply(current_state)
-                if next_state:
-                    next_state_hash = hash(next_state)
-                    if next_state_hash not in visited_hashes:
-                        visited_hashes.add(next_state_hash)
-                        queue.append((next_state, path + [type(move).__name__]))
-
-        return None
+        path, _ = breadth_first_search(state)
+        return path[0] if path else None
 
     def _print_board(self, level_index: int, state: GameState, version: str):
         """Prints the game board.
@@ -0,0 +1,117 @@
+import multiprocessing
+import queue
+import time
+from typing import List, Optional, Tuple
+
+from search_algorithm import SearchAlgorithm
+
+POLL_INTERVAL = 0.5 # Seconds between two checks for processes that died without reporting
+
+
+def _run_configuration(name: str, algorithm: SearchAlgorithm, results: multiprocessing.Queue):
+    """Solves with one configuration of a portfolio and reports the result.
+
+    Args:
+        name (str): The name of the configuration.
+        algorithm (SearchAlgorithm): The algorithm to run.
+        results (multiprocessing.Queue): The queue receiving (name, path, moves, optimal, error), where
+            error describes the exception the algorithm raised, or is None.
+    """
+    try:
+        path, moves = algorithm.solve()
+        error = None
+    except Exception as e:
+        path, moves = None, None
+        error = f"{type(e).__name__}: {e}"
+    results.put((name, path, moves, algorithm.optimal, error))
+
+
+class PortfolioSolver:
+    """Races several algorithms on the same level in parallel processes.
+
+    Every configuration runs in its own process. The first solution wins, or,
+    when an optimal one is required, the first solution from an algorithm that
+    guarantees optimality. All other processes are then terminated. The
+    configurations that failed during the last race are listed in errors.
+    """
+
+    def __init__(self, configurations: List[Tuple[str, SearchAlgorithm]]):
+        """Initializes the PortfolioSolver.
+
+        Args:
+            configurations (List[Tuple[str, SearchAlgorithm]]): The names and algorithm instances to race.
+        """
+        self.configurations = configurations
+        self.errors = [] # (name, description) of every configuration that failed in the last race
+
+    def race(self, require_optimal: bool = False, time_limit: float = None) -> Optional[dict]:
+        """Runs all configurations until one of them wins.
+
+        If optimality is required but every configuration finished without an
+        optimal solution, the shortest solution found is returned instead.
+
+        Args:
+            require_optimal (bool, optional): Only accept solutions from algorithms guaranteeing
+                optimality. Defaults to False.
+            time_limit (float, optional): The number of seconds after which the race is abandoned.
+                Defaults to None, for no limit.
+
+        Returns:
+            Optional[dict]: The winning configuration, its solution, the number of moves, whether it
+                is proven optimal and the seconds elapsed, or None if no configuration solved the level.
+        """
+        self.errors = []
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=_run_configuration, args=(name, algorithm, results))
+                     for name, algorithm in self.configurations]
+        start_time = time.time()
+        for process in processes:
+            process.start()
+
+        winner = None
+        fallback = None
+        reported = 0
+        crashed = set()
+        try:
+            while reported + len(crashed) < len(processes):
+                timeout = POLL_INTERVAL
+                if time_limit is not None:
+                    remaining = time_limit - (time.time() - start_time)
+                    if remaining <= 0:
+                        break
+                    timeout = min(timeout, remaining)
+                try:
+                    name, path, moves, optimal, error = results.get(timeout=timeout)
+                except queue.Empty:
+                    # A process ending with an error code was killed or crashed before it could report
+                    for (name, _), process in zip(self.configurations, processes):
+                        if process.exitcode not in (None, 0) and process not in crashed:
+                            crashed.add(process)
+                            self.errors.append((name, f"process exited with code {process.exitcode}"))
+                    continue
+                reported += 1
+                if error is not None:
+                    self.errors.append((name, error))
+                if path is None:
+                    continue
+                result = {
+                    "winner": name,
+                    "solution": path,
+                    "solution_moves": moves,
+                    "optimal": optimal,
+                    "time": time.time() - start_time
+                }
+                if optimal or not require_optimal:
+                    winner = result
+                    break
+                if fallback is None or moves < fallback["solution_moves"]:
+                    fallback = result
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for process in processes:
+                process.join()
+            results.close()
+
+        return winner or fallback
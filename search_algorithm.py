@@ -1,14 +1,41 @@
 import heapq
+import math
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List, Set, Tuple
+from array import array
+from collections import deque
+from queue import Queue
+from typing import Iterator, List, NamedTuple, Optional, Tuple
 
+import numpy as np
+
+from bitboard import BitboardState
+from bucket_queue import BucketQueue, TwoLevelBucketQueue
 from game_state import GameState
 from heuristic import Heuristic
-from metrics_collector import MetricsCollector
-from move import POSSIBLE_MOVES
+from metrics_collector import MetricsCollector, ProgressSnapshot
+from move import POSSIBLE_MOVES, generate_successors, predecessors
+from node_store import NodeStore
+from search_budget import CancellationToken, SearchBudget, SearchInterrupted, SearchStatus
+from vectorized_frontier import encode_state, layer_keys, slide_layer, solved_mask, target_grid
+from visited_set import VisitedSet
+
+
+class SearchResult(NamedTuple):
+    """Outcome of SearchAlgorithm.run()."""
+    status: SearchStatus
+    solution: Optional[List[str]]
+    solution_moves: Optional[int]
+    metrics_collector: MetricsCollector
 
 
 class SearchAlgorithm(ABC):
+    optimal = False # Whether solutions are guaranteed shortest, set per instance when it depends on the heuristic
+
     def __init__(self, initial_state: GameState, heuristic_func: Heuristic = None):
         """Initializes the search algorithm.
 
@@ -19,6 +46,9 @@ class SearchAlgorithm(ABC):
         self.initial_state = initial_state
         self.heuristic = heuristic_func
         self.metrics_collector = MetricsCollector()
+        self.result = None # SearchResult of the last solve_iter() run
+        # Set by searches returning their best solution so far when a budget stops them
+        self.stop_status = None
 
     @abstractmethod
     def solve(self) -> Tuple[List[str], int]:
@@ -29,34 +59,334 @@ class SearchAlgorithm(ABC):
         """
         pass
 
+    def set_budget(self, node_limit: int = None, time_limit: float = None, memory_limit: int = None,
+                   cancellation_token: CancellationToken = None) -> 'SearchAlgorithm':
+        """Limits the resources of the search, checked every time a state is expanded.
+
+        Args:
+            node_limit (int, optional): The maximum number of states expanded. Defaults to None, for no limit.
+            time_limit (float, optional): The maximum number of seconds. Defaults to None, for no limit.
+            memory_limit (int, optional): The maximum number of bytes allocated by the search.
+                Defaults to None, for no limit.
+            cancellation_token (CancellationToken, optional): A token stopping the search once cancelled.
+                Defaults to None.
+
+        Returns:
+            SearchAlgorithm: The algorithm itself.
+        """
+        self.metrics_collector.budget = SearchBudget(node_limit, time_limit, memory_limit, cancellation_token)
+        return self
+
+    def run(self) -> SearchResult:
+        """Solves the game within the budget.
+
+        Returns:
+            SearchResult: How the search ended, the solution if one was found and the metrics
+                collected so far.
+        """
+        self.stop_status = None
+        try:
+            solution, solution_moves = self.solve()
+        except SearchInterrupted as interruption:
+            self.metrics_collector.stop()
+            return SearchResult(interruption.status, None, None, self.metrics_collector)
+        if self.stop_status is not None:
+            status = self.stop_status
+        else:
+            status = SearchStatus.SOLVED if solution is not None else SearchStatus.EXHAUSTED
+        return SearchResult(status, solution, solution_moves, self.metrics_collector)
+
+    def solve_iter(self, interval: int = 1000) -> Iterator[ProgressSnapshot]:
+        """Runs the search in a background thread, yielding its progress as it goes.
+
+        The search pauses at every snapshot until the next one is requested,
+        so the caller sets the pace, for instance one step per frame. Closing
+        the iterator early cancels the search, and the cancellation is
+        withdrawn once the search stopped, so that later runs are not
+        affected. Once the iteration is over, the outcome is available in
+        self.result.
+
+        Args:
+            interval (int, optional): The number of states expanded between snapshots. Defaults to 1000.
+
+        Yields:
+            ProgressSnapshot: The progress of the search.
+        """
+        budget = self.metrics_collector.budget
+        if budget is None:
+            budget = self.metrics_collector.budget = SearchBudget()
+        token = budget.cancellation_token
+        if token is None:
+            token = budget.cancellation_token = CancellationToken()
+        cancelled = False
+
+        snapshots = Queue(maxsize=1)
+        resume = threading.Event() # Set once the caller asks for the next snapshot
+        finished = object()
+        errors = []
+
+        def report(snapshot: ProgressSnapshot):
+            resume.clear()
+            snapshots.put(snapshot)
+            resume.wait()
+
+        def run_search():
+            try:
+                self.result = self.run()
+            except Exception as error:
+                errors.append(error)
+            finally:
+                snapshots.put(finished)
+
+        self.result = None
+        self.metrics_collector.set_progress(report, interval)
+        thread = threading.Thread(target=run_search, daemon=True)
+        thread.start()
+        try:
+            snapshot = snapshots.get()
+            while snapshot is not finished:
+                yield snapshot
+                resume.set()
+                snapshot = snapshots.get()
+        finally:
+            if thread.is_alive() and snapshot is not finished:
+                # The caller stopped early, let the search unblock and notice the cancellation
+                token.cancel()
+                cancelled = True
+                resume.set()
+                while snapshots.get() is not finished:
+                    resume.set()
+            thread.join()
+            if cancelled:
+                token.reset()
+            self.metrics_collector.set_progress(None)
+        if errors:
+            raise errors[0]
+
+def breadth_first_search(initial_state: GameState,
+                         metrics_collector: MetricsCollector = None) -> Tuple[Optional[List[str]], List[int]]:
+    """Runs a breadth-first search with a deque frontier.
+
+    Goals are tested when states are generated rather than when they are
+    expanded, which saves expanding the whole last layer.
+
+    Args:
+        initial_state (GameState): The state to search from.
+        metrics_collector (MetricsCollector, optional): Collector tracking expanded and duplicate
+            states. Defaults to None.
+
+    Returns:
+        Tuple[Optional[List[str]], List[int]]: The shortest solution path, or None if there is no
+            solution, and the number of states generated at each depth.
+    """
+    if metrics_collector is None:
+        metrics_collector = MetricsCollector()
+    layer_sizes = [1]
+    if initial_state.is_solved():
+        return [], layer_sizes
+
+    nodes = NodeStore()
+    initial_key = initial_state.key()
+    queue = deque([(initial_state, initial_key, nodes.add_root(), 0)])
+    visited_keys = VisitedSet()
+    visited_keys.add(initial_key)
+    metrics_collector.track_search(queue, visited_keys)
+    metrics_collector.track_bound(0)
+
+    while queue:
+        current_state, current_key, node, depth = queue.popleft()
+        metrics_collector.track_bound(depth)
+        metrics_collector.track_state()
+
+        for move_code, next_state, next_key in generate_successors(current_state):
+            if not visited_keys.add(next_key):
+                metrics_collector.track_duplicate()
+                continue
+            if depth + 1 == len(layer_sizes):
+                layer_sizes.append(0)
+            layer_sizes[depth + 1] += 1
+            child = nodes.add(node, move_code)
+            if next_state.is_solved():
+                return nodes.path(child), layer_sizes
+            queue.append((next_state, next_key, child, depth + 1))
+
+    return None, layer_sizes
+
 class BFS(SearchAlgorithm):
+    optimal = True
+
+    def __init__(self, initial_state: GameState, vectorized: bool = False):
+        """Initializes the BFS algorithm.
+
+        Args:
+            initial_state (GameState): The initial state of the game.
+            vectorized (bool, optional): Expand whole layers as NumPy arrays instead of
+                one state at a time. Defaults to False.
+        """
+        super().__init__(initial_state)
+        self.vectorized = vectorized
+        self.layer_sizes = []
+
     def solve(self) -> Tuple[List[str], int]:
+        if self.vectorized:
+            return self._solve_vectorized()
+
         self.metrics_collector.start()
-        queue = [(self.initial_state, [])]
-        visited_hashes = set()
-        visited_hashes.add(hash(self.initial_state))
+        path, self.layer_sizes = breadth_first_search(self.initial_state, self.metrics_collector)
+        self.metrics_collector.stop()
+        if path is None:
+            return None, None
+        return path, len(path)
 
-        while queue:
-            current_state, path = queue.pop(0)
-            self.metrics_collector.track_state()
+    def _solve_vectorized(self) -> Tuple[List[str], int]:
+        """Solves the game with a layer-synchronous BFS over NumPy arrays.
 
-            if current_state.is_solved():
+        The whole frontier is kept as one array of encoded grids. Every slide is
+        applied to the entire layer at once, and the children are deduplicated
+        with np.unique and against the sorted array of visited grids.
+        """
+        self.metrics_collector.start()
+        targets = target_grid(self.initial_state.board)
+        frontier = encode_state(self.initial_state)[np.newaxis]
+        visited = layer_keys(frontier)
+        # Per layer, the index in the previous layer of each state's parent and the move leading to it
+        layers = []
+        self.layer_sizes = [1]
+
+        if self.initial_state.is_solved():
+            self.metrics_collector.stop()
+            return [], 0
+
+        while len(frontier):
+            self.metrics_collector.track_search(frontier, visited)
+            self.metrics_collector.track_bound(len(layers))
+            self.metrics_collector.track_state(len(frontier))
+            children, parents, moves = [], [], []
+            for move_code, move in enumerate(POSSIBLE_MOVES):
+                grids, moved = slide_layer(frontier, move.direction)
+                moved_indexes = np.flatnonzero(moved)
+                children.append(grids[moved_indexes])
+                parents.append(moved_indexes)
+                moves.append(np.full(len(moved_indexes), move_code, dtype=np.int8))
+            children = np.concatenate(children)
+            parents = np.concatenate(parents)
+            moves = np.concatenate(moves)
+
+            keys, first_indexes = np.unique(layer_keys(children), return_index=True)
+            positions = np.minimum(np.searchsorted(visited, keys), len(visited) - 1)
+            new = visited[positions] != keys
+            keys, first_indexes = keys[new], first_indexes[new]
+            self.metrics_collector.track_duplicate(len(children) - len(keys))
+
+            frontier = children[first_indexes]
+            layers.append((parents[first_indexes], moves[first_indexes]))
+            self.layer_sizes.append(len(frontier))
+            visited = np.sort(np.concatenate([visited, keys]))
+
+            solved = np.flatnonzero(solved_mask(frontier, targets))
+            if len(solved):
                 self.metrics_collector.stop()
+                path = []
+                index = solved[0]
+                for layer_parents, layer_moves in reversed(layers):
+                    path.append(type(POSSIBLE_MOVES[layer_moves[index]]).__name__)
+                    index = layer_parents[index]
+                path.reverse()
                 return path, len(path)
 
-            for move in POSSIBLE_MOVES:
-                next_state = move.apply(current_state)
-                if next_state:
-                    next_state_hash = hash(next_state)
-                    if next_state_hash not in visited_hashes:
-                        visited_hashes.add(next_state_hash)
-                        queue.append((next_state, path + [type(move).__name__]))
-
         self.metrics_collector.stop()
         return None, None
 
+class BidirectionalBFS(SearchAlgorithm):
+    """Breadth-first search from both the initial state and the goal.
+
+    The goal configuration is unique, with every tile on a target of its
+    color, so a backward search can start from it using the predecessors of
+    the slide rules. The side with the smaller frontier is expanded one whole
+    layer at a time until a state generated by one side was already reached
+    by the other one.
+    """
+    optimal = True
+
+    def solve(self) -> Tuple[List[str], int]:
+        self.metrics_collector.start()
+        initial_state = self.initial_state
+        goal_state = GameState(dict(initial_state.targets), board=initial_state.board)
+        if isinstance(initial_state, BitboardState):
+            # Both sides need keys of the same representation
+            goal_state = BitboardState.from_game_state(goal_state)
+
+        # Per side: the tree of moves, the (node, depth) of every reached key and the current layer
+        forward_nodes, backward_nodes = NodeStore(), NodeStore()
+        forward_reached = {initial_state.key(): (forward_nodes.add_root(), 0)}
+        backward_reached = {goal_state.key(): (backward_nodes.add_root(), 0)}
+        forward_layer = [(initial_state, initial_state.key())]
+        backward_layer = [(goal_state, goal_state.key())]
+
+        meeting = initial_state.key() if initial_state.key() in backward_reached else None
+        while meeting is None and forward_layer and backward_layer:
+            # The frontier reported is the layer about to be expanded, the bound the summed depths of both sides
+            self.metrics_collector.track_search(min(forward_layer, backward_layer, key=len), None)
+            self.metrics_collector.track_bound(
+                forward_reached[forward_layer[0][1]][1] + backward_reached[backward_layer[0][1]][1])
+            if len(forward_layer) <= len(backward_layer):
+                forward_layer, meeting = self._expand_layer(
+                    forward_layer, forward_nodes, forward_reached, backward_reached, generate_successors)
+            else:
+                backward_layer, meeting = self._expand_layer(
+                    backward_layer, backward_nodes, backward_reached, forward_reached, self._predecessors)
+
+        self.metrics_collector.stop()
+        if meeting is None:
+            return None, None
+        # Backward nodes hold the moves from each state towards the goal, so their path is read in reverse
+        path = (forward_nodes.path(forward_reached[meeting][0])
+                + backward_nodes.path(backward_reached[meeting][0])[::-1])
+        return path, len(path)
+
+    @staticmethod
+    def _predecessors(state: GameState) -> List[Tuple[int, GameState, int]]:
+        """Lists the predecessors of a state in the format of generate_successors."""
+        return [(move_code, previous_state, previous_state.key()) for move_code, previous_state in predecessors(state)]
+
+    def _expand_layer(self, layer: List[Tuple[GameState, int]], nodes: NodeStore, reached: dict,
+                      other_reached: dict, neighbours) -> Tuple[List[Tuple[GameState, int]], Optional[int]]:
+        """Expands one whole layer of a side.
+
+        The layer is finished even after a meeting is found, keeping the
+        meeting closest to the other side's root, so that the joined path is a
+        shortest one.
+
+        Args:
+            layer (List[Tuple[GameState, int]]): The states of the current layer with their keys.
+            nodes (NodeStore): The search tree of the side.
+            reached (dict): The (node, depth) of every key reached by the side.
+            other_reached (dict): The (node, depth) of every key reached by the other side.
+            neighbours: A function listing (move_code, state, key) for the neighbours of a state.
+
+        Returns:
+            Tuple[List[Tuple[GameState, int]], Optional[int]]: The next layer and the key of the
+                best meeting state, or None if the sides did not meet.
+        """
+        next_layer = []
+        meeting = None
+        for state, state_key in layer:
+            self.metrics_collector.track_state()
+            node, depth = reached[state_key]
+            for move_code, next_state, next_key in neighbours(state):
+                if next_key in reached:
+                    self.metrics_collector.track_duplicate()
+                    continue
+                reached[next_key] = (nodes.add(node, move_code), depth + 1)
+                next_layer.append((next_state, next_key))
+                if next_key in other_reached and (
+                        meeting is None or other_reached[next_key][1] < other_reached[meeting][1]):
+                    meeting = next_key
+        return next_layer, meeting
+
 class IDS(SearchAlgorithm):
     """Iterative Deepening Search algorithm."""
+    optimal = True
 
     def __init__(self, initial_state: 'GameState', optimal_moves: int = None):
         """Initializes the IDS algorithm.
@@ -73,8 +403,9 @@ class IDS(SearchAlgorithm):
         self.metrics_collector.start()
 
         for depth_limit in range(self.optimal_moves + 1):  # Iterate through depths
-            visited_hashes = set()  # Reset visited_hashes for each depth
-            result = self._dls(self.initial_state, [], 0, depth_limit, visited_hashes)
+            visited_keys = VisitedSet(depth_limit + 1)  # Reset visited_keys for each depth
+            self.metrics_collector.track_bound(depth_limit)
+            result = self._dls(self.initial_state, self.initial_state.key(), [], 0, depth_limit, visited_keys)
             if result:
                 self.metrics_collector.stop()
                 return result
@@ -82,33 +413,173 @@ class IDS(SearchAlgorithm):
         self.metrics_collector.stop()
         return None, None
 
-    def _dls(self, state: 'GameState', path: List[str], current_depth: int, depth_limit: int, visited_hashes: Set[int]) -> Tuple[List[str], int]:
+    def _dls(self, state: 'GameState', state_key: int, path: List[str], current_depth: int, depth_limit: int, visited_keys: VisitedSet) -> Tuple[List[str], int]:
         """Depth-Limited Search helper function."""
         self.metrics_collector.track_state()
 
         if state.is_solved():
-            return path, len(path)
+            return list(path), len(path)
 
         if current_depth == depth_limit:
             return None  # Cutoff
 
-        state_hash = hash(state)
-        if state_hash in visited_hashes:
+        if not visited_keys.add(state_key):
+            self.metrics_collector.track_duplicate()
             return None
 
-        visited_hashes.add(state_hash)
-
-        for move in POSSIBLE_MOVES:
-            next_state = move.apply(state)
-            if next_state:
-                new_path = path + [type(move).__name__]
-                # Pass a copy of visited_hashes to avoid modifying the parent's set
-                result = self._dls(next_state, new_path, current_depth + 1, depth_limit, visited_hashes.copy())
-                if result:
-                    return result
+        for move_code, next_state, next_key in generate_successors(state):
+            # The path list is shared along the recursion, extended and restored in place
+            path.append(type(POSSIBLE_MOVES[move_code]).__name__)
+            # Pass a copy of visited_keys to avoid modifying the parent's set
+            result = self._dls(next_state, next_key, path, current_depth + 1, depth_limit, visited_keys.copy())
+            path.pop()
+            if result:
+                return result
 
         return None
 
+class IDAstar(SearchAlgorithm):
+    """Iterative Deepening A* bounded by the f-values of a heuristic.
+
+    Each iteration is a depth-first search cut off at states whose path cost
+    plus heuristic exceeds the bound, which then grows to the smallest f-value
+    that was cut off. Memory stays flat: cycles are checked against the keys
+    on the current path only, and repeated states are detected through a
+    fixed-size transposition table remembering the depth each state was
+    searched at during the current iteration. The search gives up once an
+    iteration cuts nothing off, or once every successor generated in an
+    iteration was searched in it as well, which is only checked while the
+    states of an iteration fit in the size of the table.
+    """
+    TABLE_SIZE = 1 << 16 # Number of transposition table slots, a power of two
+
+    def __init__(self, initial_state: GameState, heuristic_func: Heuristic = None, table_size: int = TABLE_SIZE):
+        """Initializes the IDA* algorithm.
+
+        Args:
+            initial_state (GameState): The initial state of the game.
+            heuristic_func (Heuristic, optional): The heuristic giving the cost bound.
+            table_size (int, optional): The number of transposition table slots, a power of two.
+                Defaults to TABLE_SIZE.
+        """
+        super().__init__(initial_state, heuristic_func)
+        self.table_size = table_size
+        self.optimal = heuristic_func is not None and heuristic_func.admissible
+
+    def solve(self) -> Tuple[List[str], int]:
+        if not self.heuristic:
+            raise ValueError("IDA* search requires a heuristic function")
+
+        self.metrics_collector.start()
+        self._table_keys = [None] * self.table_size
+        self._table_depths = array('H', [0]) * self.table_size
+        self._table_iterations = array('I', [0]) * self.table_size
+        self._iteration = 0
+
+        path = []
+        bound = self.heuristic.evaluate(self.initial_state)
+        path_keys = set()
+        self.metrics_collector.track_search(None, path_keys)
+        while True:
+            self._iteration += 1
+            # Keys of the states searched and generated in this iteration, None once there are too many
+            self._searched_keys = set()
+            self._generated_keys = set()
+            self.metrics_collector.track_bound(bound)
+            result = self._search(self.initial_state, 0, bound, path, path_keys)
+            if result is True:
+                self.metrics_collector.stop()
+                return list(path), len(path)
+            if result == math.inf or (self._generated_keys is not None
+                                      and self._generated_keys <= self._searched_keys):
+                # A larger bound cannot reach a state this iteration has not searched
+                self.metrics_collector.stop()
+                return None, None
+            bound = result
+
+    def _search(self, state: GameState, depth: int, bound: int, path: List[str], path_keys: set):
+        """Depth-first search below the current cost bound.
+
+        Args:
+            state (GameState): The state to expand.
+            depth (int): The number of moves from the initial state.
+            bound (int): The maximum f-value searched in this iteration.
+            path (List[str]): The moves leading to the state, extended and restored in place.
+            path_keys (set): The keys of the states on the path above the state.
+
+        Returns:
+            The value True if a solution was found and left in path, otherwise the smallest
+                f-value exceeding the bound below this state, or math.inf if there is none.
+        """
+        self.metrics_collector.track_state()
+        if state.is_solved():
+            return True
+
+        state_key = state.key()
+        if not self._record(state, state_key, depth):
+            self.metrics_collector.track_duplicate()
+            return math.inf
+
+        next_bound = math.inf
+        children = []
+        searched_keys, generated_keys = self._searched_keys, self._generated_keys
+        if searched_keys is not None:
+            searched_keys.add(state_key)
+        for move_code, next_state, next_key in generate_successors(state):
+            if generated_keys is not None:
+                generated_keys.add(next_key)
+            if next_key in path_keys:
+                self.metrics_collector.track_duplicate()
+                continue
+            f_value = depth + 1 + self.heuristic.evaluate(next_state)
+            if f_value > bound:
+                next_bound = min(next_bound, f_value)
+            else:
+                children.append((f_value, move_code, next_state))
+        if generated_keys is not None and len(generated_keys) > self.table_size:
+            self._searched_keys = self._generated_keys = None
+        # Searching the most promising children first finds the solution early in the last iteration
+        children.sort(key=lambda child: child[0])
+
+        path_keys.add(state_key)
+        for _, move_code, next_state in children:
+            path.append(type(POSSIBLE_MOVES[move_code]).__name__)
+            result = self._search(next_state, depth + 1, bound, path, path_keys)
+            if result is True:
+                return True
+            path.pop()
+            next_bound = min(next_bound, result)
+        path_keys.discard(state_key)
+        return next_bound
+
+    def _record(self, state: GameState, state_key: int, depth: int) -> bool:
+        """Records a visit of a state in the transposition table.
+
+        A state already searched in this iteration at the same or a smaller
+        depth cannot lead to anything new. On a slot collision the entry from
+        an older iteration or the deeper one is replaced, as shallower entries
+        stand for larger subtrees.
+
+        Args:
+            state (GameState): The state visited.
+            state_key (int): The key of the state.
+            depth (int): The number of moves from the initial state.
+
+        Returns:
+            bool: False if the state was already searched at no greater depth, True otherwise.
+        """
+        slot = hash(state) & (self.table_size - 1)
+        current = self._table_iterations[slot] == self._iteration
+        if current and self._table_keys[slot] == state_key:
+            if self._table_depths[slot] <= depth:
+                return False
+        elif current and self._table_depths[slot] < depth:
+            return True
+        self._table_keys[slot] = state_key
+        self._table_depths[slot] = depth
+        self._table_iterations[slot] = self._iteration
+        return True
+
 class GreedySearch(SearchAlgorithm):
     """Greedy Best-First Search using a heuristic function."""
     
@@ -118,68 +589,807 @@ class GreedySearch(SearchAlgorithm):
             
         self.metrics_collector.start()
         
-        # Priority queue with (heuristic_value, state_id, state, path)
-        # state_id is used to break ties and ensure deterministic behavior
-        priority_queue = [(self.heuristic.evaluate(self.initial_state), 0, self.initial_state, [])]
-        visited_hashes = set([hash(self.initial_state)])
-        state_counter = 1
-        
-        while priority_queue:
-            _, _, current_state, path = heapq.heappop(priority_queue)
+        # Bucket queue of (state, key, node) by heuristic value, ties are expanded in generation order
+        nodes = NodeStore()
+        initial_key = self.initial_state.key()
+        open_list = BucketQueue()
+        open_list.push(self.heuristic.evaluate(self.initial_state), (self.initial_state, initial_key, nodes.add_root()))
+        visited_keys = VisitedSet()
+        visited_keys.add(initial_key)
+        self.metrics_collector.track_search(open_list, visited_keys)
+
+        while open_list:
+            _, (current_state, current_key, node) = open_list.pop()
             self.metrics_collector.track_state()
 
             if current_state.is_solved():
                 self.metrics_collector.stop()
+                path = nodes.path(node)
                 return path, len(path)
                 
-            for move in POSSIBLE_MOVES:
-                next_state = move.apply(current_state)
-                if next_state:
-                    next_state_hash = hash(next_state)
-                    if next_state_hash not in visited_hashes:
-                        visited_hashes.add(next_state_hash)
-                        new_path = path + [type(move).__name__]
-                        h_value = self.heuristic.evaluate(next_state)
-                        heapq.heappush(priority_queue, (h_value, state_counter, next_state, new_path))
-                        state_counter += 1
+            for move_code, next_state, next_key in generate_successors(current_state):
+                if visited_keys.add(next_key):
+                    h_value = self.heuristic.evaluate(next_state)
+                    open_list.push(h_value, (next_state, next_key, nodes.add(node, move_code)))
+                else:
+                    self.metrics_collector.track_duplicate()
                         
         self.metrics_collector.stop()
         return None, None
 
 
 class Astar(SearchAlgorithm):
-    """Greedy Best-First Search using a heuristic function."""
+    """A* search ranking states by path cost plus heuristic.
+
+    The cheapest known number of moves to every generated state is kept, so
+    a state reached again through a shorter path is queued again, even if it
+    was already expanded. Outdated queue entries are skipped when popped
+    instead of being removed. Goals are tested when states are expanded,
+    which makes the solution optimal for admissible heuristics. Among equal
+    f-values the state with the highest path cost is popped first, as it is
+    the closest to a goal according to the heuristic.
+    """
+
+    def __init__(self, initial_state: GameState, heuristic_func: Heuristic = None):
+        """Initializes the A* algorithm.
+
+        Args:
+            initial_state (GameState): The initial state of the game.
+            heuristic_func (Heuristic, optional): The heuristic function to use.
+        """
+        super().__init__(initial_state, heuristic_func)
+        self.optimal = heuristic_func is not None and heuristic_func.admissible
 
     def solve(self) -> Tuple[List[str], int]:
         if not self.heuristic:
-            raise ValueError("Greedy search requires a heuristic function")
+            raise ValueError("A* search requires a heuristic function")
 
         self.metrics_collector.start()
 
-        # Priority queue with (heuristic_value, state_id, state, path)
-        # state_id is used to break ties and ensure deterministic behavior
-        priority_queue = [(self.heuristic.evaluate(self.initial_state), 0, self.initial_state, [])]
-        visited_hashes = set([hash(self.initial_state)])
-        state_counter = 1
+        # Bucket queue of (state, key, node, g_value) by f_value, then by highest g_value
+        nodes = NodeStore()
+        initial_key = self.initial_state.key()
+        open_list = TwoLevelBucketQueue()
+        open_list.push(self.heuristic.evaluate(self.initial_state), 0,
+                       (self.initial_state, initial_key, nodes.add_root(), 0))
+        best_g = {initial_key: 0}
+        expanded_keys = VisitedSet()
+        self.metrics_collector.track_search(open_list, best_g)
 
-        while priority_queue:
-            _, _, current_state, path = heapq.heappop(priority_queue)
+        while open_list:
+            f_value, (current_state, current_key, node, g_value) = open_list.pop()
+            if g_value > best_g[current_key]:
+                self.metrics_collector.track_stale()
+                continue
+            self.metrics_collector.track_bound(f_value)
             self.metrics_collector.track_state()
 
             if current_state.is_solved():
+                self.metrics_collector.stop()
+                path = nodes.path(node)
+                return path, len(path)
+
+            expanded_keys.add(current_key)
+            next_g = g_value + 1
+            for move_code, next_state, next_key in generate_successors(current_state):
+                known_g = best_g.get(next_key)
+                if known_g is not None and known_g <= next_g:
+                    self.metrics_collector.track_duplicate()
+                    continue
+                if known_g is not None and next_key in expanded_keys:
+                    self.metrics_collector.track_reopened()
+                best_g[next_key] = next_g
+                f_value = next_g + self.heuristic.evaluate(next_state)
+                open_list.push(f_value, next_g, (next_state, next_key, nodes.add(node, move_code), next_g))
+
+        self.metrics_collector.stop()
+        return None, None
+
+
+class ARAstar(SearchAlgorithm):
+    """Anytime Repairing A* (ARA*) over weighted f-values.
+
+    A first solution is found quickly by ranking states with g + weight * h
+    for a large weight. The weight is then lowered step by step and every
+    following search reuses the path costs found so far, searching again only
+    the states whose cost improved after they were expanded. Each improved
+    solution is recorded in solutions together with a bound on how many
+    times longer than optimal it can be, and the search stops once the weight
+    reaches 1 or when the time or node budget runs out. A search stopped by
+    its own limits or by the budget of set_budget() still returns the best
+    solution found so far, and run() reports it as budget-exceeded.
+    """
+
+    def __init__(self, initial_state: GameState, heuristic_func: Heuristic = None, initial_weight: float = 3.0,
+                 weight_step: float = 0.5, time_limit: float = None, node_limit: int = None):
+        """Initializes the ARA* algorithm.
+
+        Args:
+            initial_state (GameState): The initial state of the game.
+            heuristic_func (Heuristic, optional): The heuristic function to use.
+            initial_weight (float, optional): The heuristic weight of the first search. Defaults to 3.0.
+            weight_step (float, optional): How much the weight is lowered after each search. Defaults to 0.5.
+            time_limit (float, optional): The number of seconds after which the best solution so far
+                is returned. Defaults to None, for no limit.
+            node_limit (int, optional): The number of expanded states after which the best solution so
+                far is returned. Defaults to None, for no limit.
+        """
+        super().__init__(initial_state, heuristic_func)
+        self.initial_weight = initial_weight
+        self.weight_step = weight_step
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.solutions = [] # (path, suboptimality bound, seconds elapsed) for every improved solution
+
+    def solve(self) -> Tuple[List[str], int]:
+        if not self.heuristic:
+            raise ValueError("ARA* search requires a heuristic function")
+
+        self.metrics_collector.start()
+        self.solutions = []
+        self.stop_status = None
+        self._start_time = time.time()
+        self._expanded = 0
+        self._counter = 0
+        self._nodes = NodeStore()
+        initial_key = self.initial_state.key()
+        # Best known (g_value, node) of every generated key
+        self._best = {initial_key: (0, self._nodes.add_root())}
+        self._goal_key = initial_key if self.initial_state.is_solved() else None
+        # Expanded states whose cost improved during the current search, as (g_value, h_value, state, key)
+        self._inconsistent = []
+
+        weight = self.initial_weight
+        open_list = []
+        self._push(open_list, weight, 0, self.heuristic.evaluate(self.initial_state), self.initial_state, initial_key)
+        try:
+            while True:
+                completed = self._improve_path(open_list, weight)
+                self._record_solution(open_list, weight)
+                if not completed:
+                    self.stop_status = SearchStatus.BUDGET_EXCEEDED
+                    break
+                if weight <= 1:
+                    break
+                weight = max(1.0, weight - self.weight_step)
+                open_list = self._reweight(open_list, weight)
+        except SearchInterrupted as interruption:
+            # Solutions found before the interruption are still valid
+            self.stop_status = interruption.status
+            self._record_solution(open_list, weight)
+
+        self.metrics_collector.stop()
+        if not self.solutions:
+            return None, None
+        path = self.solutions[-1][0]
+        return path, len(path)
+
+    def _push(self, open_list: list, weight: float, g_value: int, h_value: int, state: GameState, state_key: int):
+        """Queues a state by its weighted f-value, ties going to the deeper state."""
+        heapq.heappush(open_list, (g_value + weight * h_value, -g_value, self._counter, h_value, state, state_key))
+        self._counter += 1
+
+    def _out_of_budget(self) -> bool:
+        """Tells whether the time or node budget is used up."""
+        if self.node_limit is not None and self._expanded >= self.node_limit:
+            return True
+        return self.time_limit is not None and time.time() - self._start_time >= self.time_limit
+
+    def _improve_path(self, open_list: list, weight: float) -> bool:
+        """Expands states until no queued state can lead to a cheaper goal under the current weight.
+
+        Args:
+            open_list (list): The heap of queued states.
+            weight (float): The heuristic weight.
+
+        Returns:
+            bool: True if the search completed, False if it was stopped by the budget.
+        """
+        closed_keys = VisitedSet()
+        self.metrics_collector.track_search(open_list, self._best)
+        while open_list:
+            f_value, negative_g, _, h_value, state, state_key = open_list[0]
+            g_value = -negative_g
+            if g_value > self._best[state_key][0]:
+                heapq.heappop(open_list)
+                self.metrics_collector.track_stale()
+                continue
+            if self._goal_key is not None and self._best[self._goal_key][0] <= f_value:
+                return True
+            if self._out_of_budget():
+                return False
+
+            heapq.heappop(open_list)
+            self.metrics_collector.track_bound(f_value)
+            self.metrics_collector.track_state()
+            self._expanded += 1
+            closed_keys.add(state_key)
+            node = self._best[state_key][1]
+            next_g = g_value + 1
+            for move_code, next_state, next_key in generate_successors(state):
+                known = self._best.get(next_key)
+                if known is not None and known[0] <= next_g:
+                    self.metrics_collector.track_duplicate()
+                    continue
+                self._best[next_key] = (next_g, self._nodes.add(node, move_code))
+                if next_state.is_solved():
+                    self._goal_key = next_key
+                next_h = self.heuristic.evaluate(next_state)
+                if next_key in closed_keys:
+                    # Searched again with the next weight rather than reopened now
+                    self.metrics_collector.track_reopened()
+                    self._inconsistent.append((next_g, next_h, next_state, next_key))
+                else:
+                    self._push(open_list, weight, next_g, next_h, next_state, next_key)
+        return True
+
+    def _reweight(self, open_list: list, weight: float) -> list:
+        """Builds the queue of the next search from the queued and inconsistent states.
+
+        Args:
+            open_list (list): The heap of queued states.
+            weight (float): The new heuristic weight.
+
+        Returns:
+            list: The new heap.
+        """
+        pending = {}
+        for _, negative_g, _, h_value, state, state_key in open_list:
+            pending[state_key] = (-negative_g, h_value, state)
+        for g_value, h_value, state, state_key in self._inconsistent:
+            pending[state_key] = (g_value, h_value, state)
+        self._inconsistent = []
+
+        new_open_list = []
+        for state_key, (g_value, h_value, state) in pending.items():
+            if g_value == self._best[state_key][0]:
+                self._push(new_open_list, weight, g_value, h_value, state, state_key)
+        return new_open_list
+
+    def _record_solution(self, open_list: list, weight: float):
+        """Records the current solution if it or its suboptimality bound improved.
+
+        The bound is the weight, tightened to the solution cost divided by the
+        smallest g + h of the states still waiting to be searched, which no
+        solution can undercut with an admissible heuristic.
+
+        Args:
+            open_list (list): The heap of queued states.
+            weight (float): The heuristic weight of the search that just ended.
+        """
+        if self._goal_key is None:
+            return
+        goal_g, goal_node = self._best[self._goal_key]
+        lower_bounds = [-negative_g + h_value for _, negative_g, _, h_value, _, state_key in open_list
+                        if -negative_g == self._best[state_key][0]]
+        lower_bounds += [g_value + h_value for g_value, h_value, _, _ in self._inconsistent]
+        if not lower_bounds:
+            bound = 1.0
+        else:
+            lowest = min(lower_bounds)
+            bound = min(weight, goal_g / lowest) if lowest > 0 else weight
+        bound = max(bound, 1.0)
+
+        if self.solutions:
+            previous_path, previous_bound, _ = self.solutions[-1]
+            if goal_g >= len(previous_path) and bound >= previous_bound:
+                return
+        self.solutions.append((self._nodes.path(goal_node), bound, time.time() - self._start_time))
+
+
+class BeamSearch(SearchAlgorithm):
+    """Breadth-first search keeping only the best states of every layer.
+
+    Each layer is cut down to the width states with the lowest heuristic
+    value, so memory grows with width times depth instead of with the number
+    of reachable states. This trades completeness and optimality for the
+    ability to solve boards far too large for exhaustive search. If no
+    solution is found, the search can restart with a wider beam.
+    """
+
+    def __init__(self, initial_state: GameState, heuristic_func: Heuristic = None, width: int = 100,
+                 max_depth: int = 100, restarts: int = 0, widening: int = 2):
+        """Initializes the beam search.
+
+        Args:
+            initial_state (GameState): The initial state of the game.
+            heuristic_func (Heuristic, optional): The heuristic ranking the states of a layer.
+            width (int, optional): The number of states kept per layer. Defaults to 100.
+            max_depth (int, optional): The number of layers searched before giving up. Defaults to 100.
+            restarts (int, optional): The number of further searches run with a wider beam
+                when one fails. Defaults to 0.
+            widening (int, optional): The factor the width is multiplied by at every restart. Defaults to 2.
+        """
+        super().__init__(initial_state, heuristic_func)
+        self.width = width
+        self.max_depth = max_depth
+        self.restarts = restarts
+        self.widening = widening
+
+    def solve(self) -> Tuple[List[str], int]:
+        if not self.heuristic:
+            raise ValueError("Beam search requires a heuristic function")
+
+        self.metrics_collector.start()
+        width = self.width
+        for _ in range(self.restarts + 1):
+            path = self._search(width)
+            if path is not None:
                 self.metrics_collector.stop()
                 return path, len(path)
+            width *= self.widening
+
+        self.metrics_collector.stop()
+        return None, None
+
+    def _search(self, width: int) -> Optional[List[str]]:
+        """Runs one beam search.
+
+        Args:
+            width (int): The number of states kept per layer.
+
+        Returns:
+            Optional[List[str]]: The solution path, or None if the beam died out or reached max_depth.
+        """
+        if self.initial_state.is_solved():
+            return []
+
+        nodes = NodeStore()
+        initial_key = self.initial_state.key()
+        beam = [(self.initial_state, nodes.add_root())]
+        # Only states that made it into a beam are remembered, at most width per layer
+        visited_keys = VisitedSet(width)
+        visited_keys.add(initial_key)
+
+        for depth in range(self.max_depth):
+            self.metrics_collector.track_search(beam, visited_keys)
+            self.metrics_collector.track_bound(depth)
+            candidates = {}
+            for state, node in beam:
+                self.metrics_collector.track_state()
+                for move_code, next_state, next_key in generate_successors(state):
+                    if next_key in visited_keys or next_key in candidates:
+                        self.metrics_collector.track_duplicate()
+                        continue
+                    if next_state.is_solved():
+                        return nodes.path(nodes.add(node, move_code))
+                    candidates[next_key] = (self.heuristic.evaluate(next_state), len(candidates), next_state, node, move_code)
+
+            best = heapq.nsmallest(width, candidates.items(), key=lambda candidate: candidate[1][:2])
+            beam = []
+            for next_key, (_, _, next_state, node, move_code) in best:
+                visited_keys.add(next_key)
+                beam.append((next_state, nodes.add(node, move_code)))
+            if not beam:
+                return None
+        return None
+
+
+def _hash_distributed_worker(connection, board, heuristic: Optional[Heuristic], workers: int, worker_index: int):
+    """Runs one partition of a HashDistributedSearch in a worker process.
+
+    The worker owns the states whose Zobrist hash modulo the number of
+    workers is its index. It keeps their best path costs, its own open list
+    and a NodeStore of the states it queued, whose parents are references
+    node * workers + worker_index to the node of the owning worker. It
+    answers the commands of the coordinating process:
+
+    - ("receive", items): queue the (tiles, g_value, parent, move_code) items
+      improving on the known costs, answer the smallest f-value queued and
+      the duplicate count.
+    - ("expand", bound): expand every queued state with an f-value within the
+      bound, answer the children per owning worker, the (g_value, reference)
+      of the cheapest goal found and the expanded and stale counts.
+    - ("node", node): answer the parent reference and move code of a node.
+    - ("stop",): exit.
+
+    Args:
+        connection: The worker's end of the pipe to the coordinator.
+        board (Board): The board of the level, shared by all states.
+        heuristic (Optional[Heuristic]): The heuristic, or None for breadth-first order.
+        workers (int): The number of workers.
+        worker_index (int): The index of this worker.
+    """
+    try:
+        _serve_partition(connection, board, heuristic, workers, worker_index)
+    except (EOFError, OSError):
+        # The coordinator closed its end, for instance after a budget interrupted it in the middle of a round
+        pass
+    finally:
+        connection.close()
+
+
+def _serve_partition(connection, board, heuristic: Optional[Heuristic], workers: int, worker_index: int):
+    """Answers the commands of the coordinator until told to stop, see _hash_distributed_worker."""
+    best_g = {}
+    open_list = []
+    nodes = NodeStore()
+    counter = 0
+    parent = multiprocessing.parent_process()
+    while True:
+        # A coordinator killed without stopping its workers, for example in a portfolio race, ends them too
+        while not connection.poll(1.0):
+            if not parent.is_alive():
+                return
+        command = connection.recv()
+        if command[0] == "stop":
+            return
+
+        if command[0] == "receive":
+            duplicates = 0
+            for tiles, g_value, parent, move_code in command[1]:
+                state = GameState(dict(tiles), board=board)
+                state_key = state.key()
+                if best_g.get(state_key, g_value + 1) <= g_value:
+                    duplicates += 1
+                    continue
+                best_g[state_key] = g_value
+                f_value = g_value + (heuristic.evaluate(state) if heuristic else 0)
+                node = nodes.add(parent, move_code)
+                heapq.heappush(open_list, (f_value, -g_value, counter, state, state_key, node))
+                counter += 1
+            connection.send((open_list[0][0] if open_list else math.inf, duplicates))
+
+        elif command[0] == "expand":
+            bound = command[1]
+            outgoing = [[] for _ in range(workers)]
+            goal = None
+            expanded = 0
+            stale = 0
+            while open_list and open_list[0][0] <= bound:
+                _, negative_g, _, state, state_key, node = heapq.heappop(open_list)
+                g_value = -negative_g
+                if g_value > best_g[state_key]:
+                    stale += 1
+                    continue
+                expanded += 1
+                reference = node * workers + worker_index
+                if state.is_solved():
+                    if goal is None or g_value < goal[0]:
+                        goal = (g_value, reference)
+                    continue
+                for move_code, next_state, _ in generate_successors(state):
+                    owner = next_state.zobrist_hash() % workers
+                    outgoing[owner].append((tuple(next_state.tiles.items()), g_value + 1, reference, move_code))
+            connection.send((outgoing, goal, expanded, stale))
+
+        elif command[0] == "node":
+            node = command[1]
+            connection.send((nodes.parents[node], nodes.moves[node]))
 
-            for move in POSSIBLE_MOVES:
-                next_state = move.apply(current_state)
-                if next_state:
-                    next_state_hash = hash(next_state)
-                    if next_state_hash not in visited_hashes:
-                        visited_hashes.add(next_state_hash)
-                        new_path = path + [type(move).__name__]
-                        h_value = self.heuristic.evaluate(next_state) + len(path)
-                        heapq.heappush(priority_queue, (h_value, state_counter, next_state, new_path))
-                        state_counter += 1
+class HashDistributedSearch(SearchAlgorithm):
+    """Hash Distributed A* (HDA*) across worker processes.
+
+    Every state is owned by the worker given by its Zobrist hash, which keeps
+    the best path costs and the open list of the states it owns. The search
+    proceeds in rounds synchronized by this process: all workers expand their
+    states whose f-value is within the current bound, and the children are
+    sent in one batch per worker to their owners, until no state within the
+    bound is left anywhere. The bound then grows to the smallest queued
+    f-value. A goal expanded within the bound is therefore an optimal one for
+    admissible heuristics, and without a heuristic the search is a parallel
+    breadth-first search.
+    """
+    STOP_TIMEOUT = 1.0 # Seconds a worker is given to exit before it is terminated, it may be in the middle of a round
+
+    def __init__(self, initial_state: GameState, heuristic_func: Heuristic = None, workers: int = None):
+        """Initializes the hash distributed search.
+
+        Args:
+            initial_state (GameState): The initial state of the game.
+            heuristic_func (Heuristic, optional): The heuristic function to use. Defaults to None,
+                for breadth-first order.
+            workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+        """
+        super().__init__(initial_state, heuristic_func)
+        self.workers = workers or os.cpu_count() or 1
+        self.optimal = heuristic_func is None or heuristic_func.admissible
+
+    def solve(self) -> Tuple[List[str], int]:
+        self.metrics_collector.start()
+        initial_state = self.initial_state
+        if isinstance(initial_state, BitboardState):
+            # Workers exchange states as tile lists of the dictionary representation
+            initial_state = initial_state.to_game_state()
+
+        # Forking from a thread other than the main one, as solve_iter() runs searches, can copy locks
+        # held by other threads into the workers, which are then started fresh instead
+        context = multiprocessing.get_context(
+            "spawn" if threading.current_thread() is not threading.main_thread() else None)
+        connections = []
+        processes = []
+        for worker_index in range(self.workers):
+            connection, worker_connection = context.Pipe()
+            process = context.Process(
+                target=_hash_distributed_worker,
+                args=(worker_connection, initial_state.board, self.heuristic, self.workers, worker_index),
+                daemon=True)
+            process.start()
+            connections.append(connection)
+            processes.append(process)
+
+        try:
+            path = self._coordinate(connections, initial_state)
+        finally:
+            for connection in connections:
+                try:
+                    connection.send(("stop",))
+                except OSError:
+                    # The worker already exited
+                    pass
+                # Closing unblocks workers still sending the replies of a round cut short by an interruption
+                connection.close()
+            for process in processes:
+                process.join(self.STOP_TIMEOUT)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+
+        self.metrics_collector.stop()
+        if path is None:
+            return None, None
+        return path, len(path)
+
+    def _coordinate(self, connections: list, initial_state: GameState) -> Optional[List[str]]:
+        """Runs the search rounds and routes the states between the workers.
+
+        Args:
+            connections (list): The pipes to the workers.
+            initial_state (GameState): The initial state of the game.
+
+        Returns:
+            Optional[List[str]]: An optimal solution path, or None if there is none.
+        """
+        batches = [[] for _ in connections]
+        batches[initial_state.zobrist_hash() % len(connections)].append(
+            (tuple(initial_state.tiles.items()), 0, NodeStore.ROOT_PARENT, NodeStore.NO_MOVE))
+        bound = math.inf
+        while True:
+            for connection, batch in zip(connections, batches):
+                connection.send(("receive", batch))
+            lowest_f = math.inf
+            for connection in connections:
+                worker_lowest_f, duplicates = connection.recv()
+                lowest_f = min(lowest_f, worker_lowest_f)
+                self.metrics_collector.track_duplicate(duplicates)
+            if lowest_f == math.inf:
+                return None
+            if lowest_f > bound or bound == math.inf:
+                # Nothing is left within the bound anywhere, move on to the next f-value
+                bound = lowest_f
+            self.metrics_collector.track_bound(bound)
+
+            for connection in connections:
+                connection.send(("expand", bound))
+            batches = [[] for _ in connections]
+            goal = None
+            for connection in connections:
+                outgoing, worker_goal, expanded, stale = connection.recv()
+                self.metrics_collector.track_state(expanded)
+                self.metrics_collector.track_stale(stale)
+                for batch, items in zip(batches, outgoing):
+                    batch.extend(items)
+                if worker_goal is not None and (goal is None or worker_goal[0] < goal[0]):
+                    goal = worker_goal
+            if goal is not None:
+                return self._goal_path(connections, goal[1])
+
+    def _goal_path(self, connections: list, reference: int) -> List[str]:
+        """Rebuilds a path by following the parent references of its goal across the workers.
+
+        Args:
+            connections (list): The pipes to the workers.
+            reference (int): The reference node * workers + worker_index of the goal.
+
+        Returns:
+            List[str]: The names of the moves, from the initial state.
+        """
+        path = []
+        while True:
+            node, worker_index = divmod(reference, len(connections))
+            connections[worker_index].send(("node", node))
+            reference, move_code = connections[worker_index].recv()
+            if reference == NodeStore.ROOT_PARENT:
+                break
+            path.append(type(POSSIBLE_MOVES[move_code]).__name__)
+        path.reverse()
+        return path
+
+
+class ExternalBFS(SearchAlgorithm):
+    """Breadth-first search keeping its layers on disk.
+
+    Each layer is a file of fixed-size big-endian packed state keys in
+    ascending order, so files compare and merge as byte strings. The children
+    of a layer are collected in memory up to buffer_size keys, then sorted
+    and written as runs. The runs are merged into the next layer, dropping
+    every key already in the file of all visited keys, which is merged with
+    each new layer in turn. Memory therefore stays bounded by the buffer
+    whatever the size of the state space. The solution path is rebuilt
+    backwards from the goal by looking up its predecessors in the layer files.
+    """
+    optimal = True
+    BUFFER_SIZE = 1 << 20 # Number of keys sorted in memory before being written as a run
+
+    def __init__(self, initial_state: GameState, buffer_size: int = BUFFER_SIZE, directory: str = None):
+        """Initializes the external-memory BFS.
+
+        Args:
+            initial_state (GameState): The initial state of the game.
+            buffer_size (int, optional): The number of keys held in memory at once. Defaults to BUFFER_SIZE.
+            directory (str, optional): The directory for the temporary layer files. Defaults to None,
+                for the system temporary directory.
+        """
+        super().__init__(initial_state)
+        self.buffer_size = buffer_size
+        self.directory = directory
+        self.layer_sizes = []
+
+    def solve(self) -> Tuple[List[str], int]:
+        self.metrics_collector.start()
+        initial_state = self.initial_state
+        if isinstance(initial_state, BitboardState):
+            # Layers are decoded into the dictionary representation
+            initial_state = initial_state.to_game_state()
+        board = initial_state.board
+        self._board = board
+        self._record_size = (board.key_bits * board.size * board.size + 7) // 8
+        goal_key = GameState(dict(board.targets), board=board).key()
+
+        with tempfile.TemporaryDirectory(dir=self.directory) as work_directory:
+            self._work_directory = work_directory
+            layers = [self._path("layer", 0)]
+            self._write_keys(layers[0], [initial_state.key()])
+            visited = self._path("visited", 0)
+            self._write_keys(visited, [initial_state.key()])
+            self.layer_sizes = [1]
+
+            depth = 0
+            found = initial_state.key() == goal_key
+            while not found and self.layer_sizes[-1]:
+                self.metrics_collector.track_bound(depth)
+                runs = self._expand_layer(layers[depth], depth)
+                depth += 1
+                layers.append(self._path("layer", depth))
+                new_visited = self._path("visited", depth)
+                size, found = self._merge_layer(runs, visited, layers[depth], new_visited, goal_key)
+                os.remove(visited)
+                visited = new_visited
+                self.layer_sizes.append(size)
+
+            path = self._rebuild_path(layers, goal_key) if found else None
 
         self.metrics_collector.stop()
-        return None, None
\ No newline at end of file
+        if path is None:
+            return None, None
+        return path, len(path)
+
+    def _path(self, name: str, index: int) -> str:
+        return os.path.join(self._work_directory, f"{name}_{index}.bin")
+
+    def _write_keys(self, file_path: str, keys):
+        """Writes ascending keys as fixed-size records."""
+        with open(file_path, "wb") as file:
+            for key in keys:
+                file.write(key.to_bytes(self._record_size, "big"))
+
+    def _read_records(self, file_path: str):
+        """Streams the records of a key file."""
+        with open(file_path, "rb") as file:
+            while True:
+                record = file.read(self._record_size)
+                if not record:
+                    return
+                yield record
+
+    def _expand_layer(self, layer_path: str, depth: int) -> List[str]:
+        """Generates the children of a layer into sorted, duplicate-free run files.
+
+        Args:
+            layer_path (str): The file of the layer.
+            depth (int): The depth of the layer.
+
+        Returns:
+            List[str]: The paths of the runs.
+        """
+        runs = []
+        buffer = set()
+        for record in self._read_records(layer_path):
+            state = GameState.from_key(self._board, int.from_bytes(record, "big"))
+            self.metrics_collector.track_state()
+            for _, _, next_key in generate_successors(state):
+                if next_key in buffer:
+                    self.metrics_collector.track_duplicate()
+                    continue
+                buffer.add(next_key)
+                if len(buffer) >= self.buffer_size:
+                    runs.append(self._path(f"run_{depth}", len(runs)))
+                    self._write_keys(runs[-1], sorted(buffer))
+                    buffer = set()
+        runs.append(self._path(f"run_{depth}", len(runs)))
+        self._write_keys(runs[-1], sorted(buffer))
+        return runs
+
+    def _merge_layer(self, runs: List[str], visited_path: str, layer_path: str, new_visited_path: str,
+                     goal_key: int) -> Tuple[int, bool]:
+        """Merges the runs of a layer into its file, removing the keys visited before.
+
+        The runs, already sorted, are merged with the visited keys in one
+        streaming pass that also writes the visited keys including the layer.
+
+        Args:
+            runs (List[str]): The run files of the layer.
+            visited_path (str): The file of all keys of the earlier layers.
+            layer_path (str): The file receiving the new layer.
+            new_visited_path (str): The file receiving all keys up to the new layer.
+            goal_key (int): The key of the goal state.
+
+        Returns:
+            Tuple[int, bool]: The size of the new layer and whether it holds the goal.
+        """
+        goal_record = goal_key.to_bytes(self._record_size, "big")
+        visited_records = self._read_records(visited_path)
+        next_visited = next(visited_records, None)
+        size = 0
+        found = False
+        previous = None
+        with open(layer_path, "wb") as layer_file, open(new_visited_path, "wb") as visited_file:
+            for record in heapq.merge(*(self._read_records(run) for run in runs)):
+                if record == previous:
+                    self.metrics_collector.track_duplicate()
+                    continue
+                previous = record
+                while next_visited is not None and next_visited < record:
+                    visited_file.write(next_visited)
+                    next_visited = next(visited_records, None)
+                if record == next_visited:
+                    self.metrics_collector.track_duplicate()
+                    continue
+                layer_file.write(record)
+                visited_file.write(record)
+                size += 1
+                found = found or record == goal_record
+            while next_visited is not None:
+                visited_file.write(next_visited)
+                next_visited = next(visited_records, None)
+        for run in runs:
+            os.remove(run)
+        return size, found
+
+    def _contains(self, file_path: str, key: int) -> bool:
+        """Binary searches a key in a key file."""
+        record = key.to_bytes(self._record_size, "big")
+        with open(file_path, "rb") as file:
+            low, high = 0, os.path.getsize(file_path) // self._record_size
+            while low < high:
+                middle = (low + high) // 2
+                file.seek(middle * self._record_size)
+                current = file.read(self._record_size)
+                if current == record:
+                    return True
+                if current < record:
+                    low = middle + 1
+                else:
+                    high = middle
+        return False
+
+    def _rebuild_path(self, layers: List[str], goal_key: int) -> List[str]:
+        """Walks back from the goal through predecessors found in each earlier layer.
+
+        Args:
+            layers (List[str]): The layer files, the last one holding the goal.
+            goal_key (int): The key of the goal state.
+
+        Returns:
+            List[str]: The moves from the initial state to the goal.
+        """
+        path = []
+        state = GameState.from_key(self._board, goal_key)
+        for layer_path in reversed(layers[:-1]):
+            for move_code, previous_state in predecessors(state):
+                if self._contains(layer_path, previous_state.key()):
+                    path.append(type(POSSIBLE_MOVES[move_code]).__name__)
+                    state = previous_state
+                    break
+        path.reverse()
+        return path
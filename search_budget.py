@@ -0,0 +1,84 @@
+import threading
+import time
+from enum import Enum
+
+
+class SearchStatus(Enum):
+    """How a search ended."""
+    SOLVED = "solved"
+    EXHAUSTED = "exhausted" # The search space was searched without finding a solution
+    BUDGET_EXCEEDED = "budget-exceeded"
+    CANCELLED = "cancelled"
+
+
+class SearchInterrupted(Exception):
+    """Raised from the expansion loop of a search to stop it early."""
+
+    def __init__(self, status: SearchStatus):
+        """Initializes the SearchInterrupted exception.
+
+        Args:
+            status (SearchStatus): Why the search was stopped.
+        """
+        super().__init__(status.value)
+        self.status = status
+
+
+class CancellationToken:
+    """Flag another thread can set to stop a running search."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Requests the search to stop at its next expansion."""
+        self._event.set()
+
+    def reset(self):
+        """Withdraws a cancellation, so that the token can be used by another search."""
+        self._event.clear()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class SearchBudget:
+    """Limits on the resources a search may use, checked at every expansion."""
+
+    def __init__(self, node_limit: int = None, time_limit: float = None, memory_limit: int = None,
+                 cancellation_token: CancellationToken = None):
+        """Initializes the SearchBudget.
+
+        Args:
+            node_limit (int, optional): The maximum number of states expanded. Defaults to None, for no limit.
+            time_limit (float, optional): The maximum number of seconds. Defaults to None, for no limit.
+            memory_limit (int, optional): The maximum number of bytes allocated by the search, as traced
+                by the metrics collector. Defaults to None, for no limit.
+            cancellation_token (CancellationToken, optional): A token stopping the search once cancelled.
+                Defaults to None.
+        """
+        self.node_limit = node_limit
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+        self.cancellation_token = cancellation_token
+
+    def check(self, states_generated: int, start_time: float, current_memory: int):
+        """Stops the search if it was cancelled or used up a limit.
+
+        Args:
+            states_generated (int): The number of states expanded so far.
+            start_time (float): The time the search started at.
+            current_memory (int): The number of bytes currently allocated by the search.
+
+        Raises:
+            SearchInterrupted: If the search has to stop.
+        """
+        if self.cancellation_token is not None and self.cancellation_token.cancelled:
+            raise SearchInterrupted(SearchStatus.CANCELLED)
+        if self.node_limit is not None and states_generated > self.node_limit:
+            raise SearchInterrupted(SearchStatus.BUDGET_EXCEEDED)
+        if self.memory_limit is not None and current_memory > self.memory_limit:
+            raise SearchInterrupted(SearchStatus.BUDGET_EXCEEDED)
+        if self.time_limit is not None and time.time() - start_time > self.time_limit:
+            raise SearchInterrupted(SearchStatus.BUDGET_EXCEEDED)
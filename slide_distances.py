@@ -0,0 +1,77 @@
+from collections import deque
+from typing import Tuple
+
+import numpy as np
+
+from board import Board
+
+UNREACHABLE = 255 # Distance stored when a tile cannot reach a target
+
+
+class SlideDistances:
+    """Exact number of slides a tile needs from every cell to every target of a level.
+
+    A breadth-first search moves one tile over the static board, blockers
+    and walls only, from every open cell. A tile alone stops at the end of
+    its ray. When the level has other tiles, any of them may be waiting
+    anywhere along the ray, so the tile may stop at every cell it passes;
+    the distances then stay lower bounds of the real number of moves, which
+    keeps the heuristics reading them admissible.
+
+    The distances are kept in a uint8 matrix with one row per open cell and
+    one column per target.
+    """
+
+    def __init__(self, board: Board):
+        """Initializes the SlideDistances and computes the matrix.
+
+        Args:
+            board (Board): The board of the level.
+        """
+        self.board = board
+        self.cells = sorted(board.open_cells, key=lambda pos: (pos[1], pos[0]))
+        self.targets = sorted(board.targets, key=lambda pos: (pos[1], pos[0]))
+        self.cell_index = {pos: i for i, pos in enumerate(self.cells)}
+        self.target_index = {pos: i for i, pos in enumerate(self.targets)}
+        self.stoppers = len(board.targets) > 1
+        self.matrix = np.full((len(self.cells), len(self.targets)), UNREACHABLE, dtype=np.uint8)
+        for start in self.cells:
+            distances = self._search(start)
+            for target, column in self.target_index.items():
+                if target in distances:
+                    self.matrix[self.cell_index[start], column] = distances[target]
+        # Nested dictionaries are faster than indexing the NumPy matrix for the single lookups of a heuristic
+        self._rows = {pos: dict(zip(self.targets, row)) for pos, row in zip(self.cells, self.matrix.tolist())}
+
+    def _search(self, start: Tuple[int, int]) -> dict:
+        """Runs the breadth-first search of a tile from a cell.
+
+        Args:
+            start (Tuple[int, int]): The cell the tile starts on.
+
+        Returns:
+            dict: The number of slides to every cell the tile can stop on.
+        """
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            pos = queue.popleft()
+            for rays in self.board.rays:
+                ray = rays[pos]
+                for stop in (ray if self.stoppers else ray[-1:]):
+                    if stop not in distances:
+                        distances[stop] = distances[pos] + 1
+                        queue.append(stop)
+        return distances
+
+    def distance(self, tile_pos: Tuple[int, int], target_pos: Tuple[int, int]) -> int:
+        """Looks up the number of slides from a cell to a target.
+
+        Args:
+            tile_pos (Tuple[int, int]): The position of the tile.
+            target_pos (Tuple[int, int]): The position of the target.
+
+        Returns:
+            int: The number of slides, or UNREACHABLE.
+        """
+        return self._rows[tile_pos][target_pos]
@@ -0,0 +1,45 @@
+import unittest
+
+from bitboard import BitboardState
+from level_manager import LevelManager
+from move import POSSIBLE_MOVES, generate_successors, predecessors
+
+
+class TestBitboardState(unittest.TestCase):
+    """The bitboard engine agrees with GameState on every reachable state."""
+
+    def reachable_states(self, level_index: int) -> list:
+        initial_state = LevelManager().levels[level_index][0].initial_state
+        reached = {initial_state.key(): initial_state}
+        stack = [initial_state]
+        while stack:
+            for _, next_state, next_key in generate_successors(stack.pop()):
+                if next_key not in reached:
+                    reached[next_key] = next_state
+                    stack.append(next_state)
+        return list(reached.values())
+
+    def test_slides_match_game_state(self):
+        for level_index in (116, 158, 174):
+            for state in self.reachable_states(level_index):
+                bitboard = BitboardState.from_game_state(state)
+                self.assertEqual(bitboard.zobrist_hash(), state.zobrist_hash())
+                for move in POSSIBLE_MOVES:
+                    next_state = move.apply(state)
+                    next_bitboard = move.apply(bitboard)
+                    if next_state is None:
+                        self.assertIsNone(next_bitboard)
+                        continue
+                    self.assertEqual(next_bitboard.tiles, next_state.tiles)
+                    self.assertEqual(next_bitboard.key(), BitboardState.from_game_state(next_state).key())
+
+    def test_predecessors_match_game_state(self):
+        for state in self.reachable_states(158):
+            bitboard = BitboardState.from_game_state(state)
+            self.assertEqual(
+                sorted(previous.key() for _, previous in predecessors(bitboard)),
+                sorted(BitboardState.from_game_state(previous).key() for _, previous in predecessors(state)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import heapq
+import random
+import unittest
+
+from bucket_queue import TwoLevelBucketQueue
+
+
+class TestTwoLevelBucketQueue(unittest.TestCase):
+    """The queue pops like a heap ordered by (priority, -tie_break, insertion)."""
+
+    def test_matches_heap_order(self):
+        rng = random.Random(0)
+        queue = TwoLevelBucketQueue()
+        heap = []
+        for counter in range(2000):
+            if heap and rng.random() < 0.4:
+                priority, _, item = heapq.heappop(heap)
+                self.assertEqual(queue.pop(), (priority, item))
+            else:
+                priority, tie_break = rng.randint(0, 8), rng.randint(0, 6)
+                queue.push(priority, tie_break, counter)
+                heapq.heappush(heap, (priority, -tie_break, counter))
+        while heap:
+            priority, _, item = heapq.heappop(heap)
+            self.assertEqual(queue.pop(), (priority, item))
+        self.assertEqual(len(queue), 0)
+        with self.assertRaises(IndexError):
+            queue.pop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import itertools
+import multiprocessing
+import random
+import time
+import unittest
+
+from game_state import GameState
+from heuristic import MaxMinMovesBlockers, MaxMinMovesSlides, MaxPatternDatabases, SumMinMovesBlockers
+from level_manager import LevelManager
+from search_algorithm import BFS, ARAstar, Astar, HashDistributedSearch, IDAstar
+from search_budget import SearchStatus
+
+
+class TestARAstarBudget(unittest.TestCase):
+    """ARA* keeps its anytime solutions when a budget stops it."""
+
+    def setUp(self):
+        self.level = LevelManager().levels[158][0]
+
+    def assert_best_solution(self, algorithm: ARAstar):
+        result = algorithm.run()
+        self.assertEqual(result.status, SearchStatus.BUDGET_EXCEEDED)
+        self.assertTrue(algorithm.solutions)
+        self.assertEqual(result.solution, algorithm.solutions[-1][0])
+        self.assertEqual(result.solution_moves, len(result.solution))
+
+    def test_search_budget_keeps_solutions(self):
+        algorithm = ARAstar(self.level.initial_state, MaxMinMovesBlockers()).set_budget(node_limit=320)
+        self.assert_best_solution(algorithm)
+
+    def test_node_limit_keeps_solutions(self):
+        algorithm = ARAstar(self.level.initial_state, MaxMinMovesBlockers(), node_limit=320)
+        self.assert_best_solution(algorithm)
+
+    def test_node_limit_without_solution(self):
+        result = ARAstar(self.level.initial_state, MaxMinMovesBlockers(), node_limit=10).run()
+        self.assertEqual(result.status, SearchStatus.BUDGET_EXCEEDED)
+        self.assertIsNone(result.solution)
+
+    def test_unlimited_search_is_solved(self):
+        result = ARAstar(self.level.initial_state, MaxMinMovesBlockers()).run()
+        self.assertEqual(result.status, SearchStatus.SOLVED)
+        self.assertEqual(result.solution_moves, self.level.optimal_moves)
+
+
+class TestRepeatedRuns(unittest.TestCase):
+    """Running the same algorithm again starts its metrics and budget from zero."""
+
+    def test_node_limit_applies_per_run(self):
+        level = LevelManager().levels[158][0]
+        algorithm = BFS(level.initial_state).set_budget(node_limit=500)
+        for _ in range(3):
+            result = algorithm.run()
+            self.assertEqual(result.status, SearchStatus.SOLVED)
+            self.assertEqual(result.solution_moves, level.optimal_moves)
+            self.assertLessEqual(result.metrics_collector.states_generated, 500)
+
+
+class TestOptimality(unittest.TestCase):
+    """Heuristic searches are optimal exactly when their heuristic is admissible."""
+
+    def setUp(self):
+        self.level = LevelManager().levels[158][0]
+
+    def test_admissible_heuristics(self):
+        for heuristic in (MaxMinMovesBlockers(), MaxPatternDatabases()):
+            for algorithm_class in (Astar, IDAstar, HashDistributedSearch):
+                algorithm = algorithm_class(self.level.initial_state, heuristic)
+                self.assertTrue(algorithm.optimal)
+                if algorithm_class is not HashDistributedSearch:
+                    self.assertEqual(algorithm.solve()[1], self.level.optimal_moves)
+
+    def test_inadmissible_heuristic(self):
+        for algorithm_class in (Astar, IDAstar, HashDistributedSearch):
+            self.assertFalse(algorithm_class(self.level.initial_state, SumMinMovesBlockers()).optimal)
+        self.assertTrue(HashDistributedSearch(self.level.initial_state).optimal)
+
+
+class TestIDAstarUnsolvable(unittest.TestCase):
+    """IDA* gives up on an unsolvable board once a larger bound cannot reach new states."""
+
+    def test_unsolvable_board(self):
+        # Tiles always stop against an edge, so the inner targets can never be covered
+        tiles = {(0, 0): "red", (5, 5): "red", (0, 5): "blue", (3, 0): "blue", (5, 2): "green"}
+        targets = {(2, 2): "red", (1, 1): "red", (0, 1): "blue", (3, 3): "blue", (1, 3): "green"}
+        blanks = [(x, y) for x in range(6) for y in range(6) if (x, y) not in tiles and (x, y) not in targets]
+        state = GameState(tiles, targets, blanks, [], 6)
+
+        for heuristic in (MaxMinMovesBlockers(), MaxMinMovesSlides()):
+            algorithm = IDAstar(state, heuristic).set_budget(node_limit=2000)
+            result = algorithm.run()
+            self.assertEqual(result.status, SearchStatus.EXHAUSTED)
+            self.assertIsNone(result.solution)
+
+
+class TestHashDistributedSearchBudget(unittest.TestCase):
+    """A budget stopping HDA* in the middle of a round ends its workers."""
+
+    def test_interrupted_round(self):
+        # A 10x10 board wide enough for the replies of a round to fill the pipes
+        rng = random.Random(3)
+        cells = [(x, y) for x in range(10) for y in range(10)]
+        rng.shuffle(cells)
+        blockers, cells = cells[:6], cells[6:]
+        colors = ["red", "blue", "green"]
+        tiles = {cells[i]: colors[i % 3] for i in range(40)}
+        targets = {cells[40 + i]: colors[i % 3] for i in range(40)}
+        state = GameState(tiles, targets, cells[80:], blockers, 10)
+
+        result = HashDistributedSearch(state, workers=2).set_budget(node_limit=500).run()
+        self.assertEqual(result.status, SearchStatus.BUDGET_EXCEEDED)
+        self.assertEqual(multiprocessing.active_children(), [])
+
+
+class TestPatternDatabases(unittest.TestCase):
+    """MaxPatternDatabases skips colors whose database would be too large."""
+
+    def test_databases_too_large(self):
+        # On an open 6x6 board every color has over PatternDatabase.MAX_ENTRIES abstract states
+        targets = {(0, 0): "red", (0, 1): "blue", (0, 2): "green", (0, 3): "red", (0, 4): "blue", (0, 5): "green"}
+        tiles = {(0, 2): "green", (0, 3): "red", (0, 5): "green", (1, 1): "blue", (1, 4): "blue", (5, 0): "red"}
+        blockers = [(3, 1), (2, 4)]
+        empty = [(x, y) for x in range(6) for y in range(6) if (x, y) not in tiles and (x, y) not in blockers]
+        state = GameState(tiles, targets, empty, blockers, 6)
+
+        heuristic = MaxPatternDatabases()
+        optimal_moves = BFS(state).solve()[1]
+        self.assertLessEqual(heuristic.evaluate(state), optimal_moves)
+        self.assertEqual(heuristic._databases, [])
+        self.assertEqual(Astar(state, heuristic).solve()[1], optimal_moves)
+
+
+class TestSolveIter(unittest.TestCase):
+    """solve_iter() runs a search in the background and leaves no state behind."""
+
+    def setUp(self):
+        self.level = LevelManager().levels[158][0]
+
+    def test_early_close_does_not_cancel_later_runs(self):
+        for algorithm in (BFS(self.level.initial_state),
+                          BFS(self.level.initial_state).set_budget(node_limit=500)):
+            search = algorithm.solve_iter(20)
+            for _ in itertools.islice(search, 2):
+                pass
+            search.close()
+            self.assertEqual(algorithm.result.status, SearchStatus.CANCELLED)
+            self.assertEqual(algorithm.run().status, SearchStatus.SOLVED)
+            list(algorithm.solve_iter(100))
+            self.assertEqual(algorithm.result.status, SearchStatus.SOLVED)
+
+    def test_search_waits_for_the_caller(self):
+        algorithm = BFS(self.level.initial_state)
+        search = algorithm.solve_iter(20)
+        snapshot = next(search)
+        time.sleep(0.1)
+        self.assertEqual(algorithm.metrics_collector.states_generated, snapshot.states_expanded)
+        search.close()
+
+    def test_hash_distributed_search(self):
+        algorithm = HashDistributedSearch(self.level.initial_state, MaxMinMovesBlockers(), workers=2)
+        list(algorithm.solve_iter(50))
+        self.assertEqual(algorithm.result.status, SearchStatus.SOLVED)
+        self.assertEqual(algorithm.result.solution_moves, self.level.optimal_moves)
+
+
+if __name__ == "__main__":
+    unittest.main()
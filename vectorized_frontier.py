@@ -0,0 +1,105 @@
+from typing import Tuple
+
+import numpy as np
+
+from board import LEFT, RIGHT, UP, Board
+from game_state import GameState
+
+EMPTY = 0
+BLOCKED = 255 # Cells tiles can never enter, colors are encoded as 1-based color indexes
+
+
+def encode_state(state: GameState) -> np.ndarray:
+    """Encodes a state as a grid of cell codes.
+
+    Args:
+        state (GameState): The state to encode.
+
+    Returns:
+        np.ndarray: A (size, size) uint8 array indexed by [y, x].
+    """
+    board = state.board
+    grid = np.full((board.size, board.size), BLOCKED, dtype=np.uint8)
+    for x, y in board.open_cells:
+        grid[y, x] = EMPTY
+    for (x, y), color in state.tiles.items():
+        grid[y, x] = board.color_index[color] + 1
+    return grid
+
+
+def target_grid(board: Board) -> np.ndarray:
+    """Encodes the targets of a board as a grid of cell codes.
+
+    Args:
+        board (Board): The board of the level.
+
+    Returns:
+        np.ndarray: A (size, size) uint8 array holding the target color code of each target cell, 0 elsewhere.
+    """
+    grid = np.zeros((board.size, board.size), dtype=np.uint8)
+    for (x, y), color in board.targets.items():
+        grid[y, x] = board.color_index[color] + 1
+    return grid
+
+
+def slide_layer(layer: np.ndarray, direction: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Applies a slide to every grid of a layer at once.
+
+    Each round moves every tile whose neighbouring cell in the direction is
+    empty by one cell, in all grids simultaneously, until no tile can move.
+
+    Args:
+        layer (np.ndarray): A (n, size, size) array of encoded grids.
+        direction (int): One of LEFT, RIGHT, UP or DOWN.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The slid grids and a boolean array telling which grids changed.
+    """
+    grids = layer.copy()
+    if direction == LEFT:
+        sources, destinations = grids[:, :, 1:], grids[:, :, :-1]
+    elif direction == RIGHT:
+        sources, destinations = grids[:, :, :-1], grids[:, :, 1:]
+    elif direction == UP:
+        sources, destinations = grids[:, 1:, :], grids[:, :-1, :]
+    else:
+        sources, destinations = grids[:, :-1, :], grids[:, 1:, :]
+
+    moved = np.zeros(len(grids), dtype=bool)
+    for _ in range(grids.shape[1] - 1):
+        step = (sources != EMPTY) & (sources != BLOCKED) & (destinations == EMPTY)
+        stepped = step.any(axis=(1, 2))
+        if not stepped.any():
+            break
+        moved |= stepped
+        # A cell is never both the source and the destination of a step, so the order of the writes does not matter
+        destinations[step] = sources[step]
+        sources[step] = EMPTY
+    return grids, moved
+
+
+def layer_keys(layer: np.ndarray) -> np.ndarray:
+    """Views every grid of a layer as one sortable key.
+
+    Args:
+        layer (np.ndarray): A (n, size, size) array of encoded grids.
+
+    Returns:
+        np.ndarray: A (n,) array of fixed-size byte strings, equal exactly when the grids are equal.
+    """
+    rows = np.ascontiguousarray(layer).reshape(len(layer), -1)
+    return rows.view(np.dtype((np.void, rows.shape[1]))).ravel()
+
+
+def solved_mask(layer: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Tells which grids of a layer have every tile on a target of its color.
+
+    Args:
+        layer (np.ndarray): A (n, size, size) array of encoded grids.
+        targets (np.ndarray): The target grid of the board.
+
+    Returns:
+        np.ndarray: A boolean (n,) array.
+    """
+    misplaced = (layer != EMPTY) & (layer != BLOCKED) & (layer != targets)
+    return ~misplaced.any(axis=(1, 2))
@@ -0,0 +1,175 @@
+from array import array
+
+
+class VisitedSet:
+    """Exact set of packed state keys stored in an open-addressing table.
+
+    Keys are non-negative integers, such as GameState.key(). Each key is split
+    into 64-bit words kept in a flat array('Q'), and membership compares the
+    whole key, so unlike a set of hash() values a collision never prunes a
+    reachable state. An entry costs 8 bytes per word plus one occupancy byte.
+    """
+    MAX_LOAD = 0.7
+    WORD_BITS = 64
+    WORD_MASK = (1 << 64) - 1
+    FIBONACCI = 0x9E3779B97F4A7C15
+
+    def __init__(self, capacity: int = 1024, words: int = 1):
+        """Initializes the VisitedSet.
+
+        Args:
+            capacity (int, optional): The number of keys to reserve space for. Defaults to 1024.
+            words (int, optional): The initial number of 64-bit words per key, grown
+                automatically when a wider key is added. Defaults to 1.
+        """
+        self._words = words
+        self._size = 0
+        self._allocate(self._slots_for(capacity))
+
+    def _slots_for(self, capacity: int) -> int:
+        """Returns the smallest power-of-two table size holding the given number of keys.
+
+        Args:
+            capacity (int): The number of keys to hold.
+
+        Returns:
+            int: The number of slots.
+        """
+        slots = 16
+        while slots * self.MAX_LOAD < capacity:
+            slots *= 2
+        return slots
+
+    def _allocate(self, slots: int):
+        """Allocates an empty table.
+
+        Args:
+            slots (int): The number of slots, a power of two.
+        """
+        self._slot_bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._table = array('Q', bytes(8 * slots * self._words))
+        self._used = bytearray(slots)
+
+    def _slot(self, key: int) -> int:
+        """Returns the home slot of a key using Fibonacci hashing.
+
+        Args:
+            key (int): The key to place.
+
+        Returns:
+            int: The index of the first slot to probe.
+        """
+        return ((hash(key) * self.FIBONACCI) & self.WORD_MASK) >> (self.WORD_BITS - self._slot_bits)
+
+    def _read(self, slot: int) -> int:
+        """Reads the key stored in a slot.
+
+        Args:
+            slot (int): The slot to read.
+
+        Returns:
+            int: The stored key.
+        """
+        if self._words == 1:
+            return self._table[slot]
+        start = slot * self._words
+        key = 0
+        for i in range(self._words - 1, -1, -1):
+            key = (key << self.WORD_BITS) | self._table[start + i]
+        return key
+
+    def _write(self, slot: int, key: int):
+        """Stores a key in a slot.
+
+        Args:
+            slot (int): The slot to write.
+            key (int): The key to store.
+        """
+        if self._words == 1:
+            self._table[slot] = key
+        else:
+            start = slot * self._words
+            for i in range(self._words):
+                self._table[start + i] = key & self.WORD_MASK
+                key >>= self.WORD_BITS
+        self._used[slot] = 1
+
+    def _rehash(self, slots: int, words: int):
+        """Moves all keys to a new table.
+
+        Args:
+            slots (int): The number of slots of the new table, a power of two.
+            words (int): The number of 64-bit words per key.
+        """
+        keys = list(self)
+        self._words = words
+        self._allocate(slots)
+        for key in keys:
+            slot = self._slot(key)
+            while self._used[slot]:
+                slot = (slot + 1) & self._mask
+            self._write(slot, key)
+
+    def add(self, key: int) -> bool:
+        """Adds a key to the set.
+
+        Args:
+            key (int): The key to add.
+
+        Returns:
+            bool: True if the key was not in the set yet, False otherwise.
+        """
+        if key.bit_length() > self._words * self.WORD_BITS:
+            words = -(-key.bit_length() // self.WORD_BITS)
+            self._rehash(len(self._used), words)
+
+        slot = self._slot(key)
+        while self._used[slot]:
+            if self._read(slot) == key:
+                return False
+            slot = (slot + 1) & self._mask
+        self._write(slot, key)
+        self._size += 1
+
+        if self._size > self.MAX_LOAD * len(self._used):
+            self._rehash(2 * len(self._used), self._words)
+        return True
+
+    def copy(self) -> 'VisitedSet':
+        """Returns a shallow copy of the set.
+
+        Returns:
+            VisitedSet: A set with the same keys.
+        """
+        clone = VisitedSet.__new__(VisitedSet)
+        clone._words = self._words
+        clone._size = self._size
+        clone._slot_bits = self._slot_bits
+        clone._mask = self._mask
+        clone._table = array('Q', self._table)
+        clone._used = bytearray(self._used)
+        return clone
+
+    @property
+    def nbytes(self) -> int:
+        """Returns the number of bytes used by the table."""
+        return self._table.itemsize * len(self._table) + len(self._used)
+
+    def __contains__(self, key: int) -> bool:
+        if key.bit_length() > self._words * self.WORD_BITS:
+            return False
+        slot = self._slot(key)
+        while self._used[slot]:
+            if self._read(slot) == key:
+                return True
+            slot = (slot + 1) & self._mask
+        return False
+
+    def __iter__(self):
+        for slot, used in enumerate(self._used):
+            if used:
+                yield self._read(slot)
+
+    def __len__(self) -> int:
+        return self._size